@@ -3,8 +3,10 @@ from flask import Flask, session
 from dotenv import load_dotenv
 
 from .config import get_config
-from .extensions import mysql
-from .common.db import get_cursor
+from .extensions import (
+    db_pool, db_replicas, aio_pool, unread_counts, user_profiles, list_versions, ticket_fragments, event_bus,
+    static_assets, compressor,
+)
 
 if (os.getenv("APP_ENV") or "").lower() in ("dev", "development"):
     load_dotenv()
@@ -13,7 +15,27 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(get_config())
 
-    mysql.init_app(app)
+    compressor.init_app(app)
+    db_pool.init_app(app)
+    db_replicas.init_app(app)
+    aio_pool.init_app(app)
+    unread_counts.init_app(app)
+    user_profiles.init_app(app)
+    list_versions.init_app(app)
+    ticket_fragments.init_app(app)
+    event_bus.init_app(app)
+    static_assets.init_app(app)
+
+    from .tickets.events import ticket_events
+    ticket_events.init_app(app)
+
+    from .monitoring import instrumentation
+    from .common import diagnostics
+    instrumentation.init_app(app)
+    diagnostics.init_app(app)
+
+    from . import cli
+    cli.init_app(app)
 
     from .main.routes import bp as main_bp
     from .auth.routes import bp as auth_bp
@@ -21,6 +43,9 @@ def create_app():
     from .tickets.routes import bp as tickets_bp
     from .users.routes import bp as users_bp
     from .messages.routes import bp as messages_bp
+    from .search.routes import bp as search_bp
+    from .stream.routes import bp as stream_bp
+    from .monitoring.routes import bp as monitoring_bp
 
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
@@ -28,6 +53,9 @@ def create_app():
     app.register_blueprint(tickets_bp)
     app.register_blueprint(users_bp)
     app.register_blueprint(messages_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(stream_bp)
+    app.register_blueprint(monitoring_bp)
 
     @app.context_processor
     def inject_year():
@@ -39,14 +67,21 @@ def create_app():
         if "user_id" not in session:
             return dict(unread_count=0)
 
-        with get_cursor() as cur:
-            cur.execute(
-                "SELECT COUNT(*) FROM messages WHERE receiver_id=%s AND is_read=0",
-                (session["user_id"],),
-            )
-            count = cur.fetchone()[0]
-        return dict(unread_count=count)
+        from .messages.unread import get_unread_count
+        return dict(unread_count=get_unread_count(session["user_id"]))
 
     return app
 
-app = create_app()
+
+_app = None
+
+
+def __getattr__(name):
+    # `from app import app` keeps working, but the app is only built on first
+    # use: CLI commands, bench and tests that call create_app() skip a second build
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,111 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session
+from flask import Blueprint, render_template, request, redirect, url_for, session, current_app
 from werkzeug.security import check_password_hash
 import re
 
 from ..common.db import get_cursor
 from ..common.decorators import login_required
+from ..common.pagination import decode_cursor, keyset_clause, split_page
+from ..extensions import user_profiles
+from ..tickets.archive import archived_requested
 from ..auth.routes import US_STATES, US_STATE_SET  # reuse your existing constants
 
 bp = Blueprint("account", __name__)
 
+
+# ---------------- Responder History ----------------
+# One feed of everything a responder has worked on, newest event first:
+# done (at completed_at), in process (at updated_at, its last change) and
+# declined (at log.created_at). A ticket can show up twice: a responder may
+# decline it and take it later, so it is both declined and done / in process.
+# The two rows carry different event times (the decline came first), so
+# (event_at, ticket id) still orders them uniquely unless both happened within
+# the same second. Every branch is a bounded range read on its own
+# (responder_id, status, <time>) index; the outer query only merges at most
+# 3 * (page_size + 1) rows, 5 * (page_size + 1) with include_archived.
+_HISTORY_BRANCHES = (
+    ("tickets", "t.completed_at", "t.responder_id = %s AND t.status = 'done'"),
+    ("tickets", "t.updated_at", "t.responder_id = %s AND t.status = 'in process'"),
+)
+_HISTORY_ARCHIVED = ("tickets_archive", "t.completed_at", "t.responder_id = %s AND t.status = 'done'")
+
+
+def _responder_history(cur, user_id, cursor, page_size, include_archived=False):
+    parts, params = [], []
+
+    branches = _HISTORY_BRANCHES + ((_HISTORY_ARCHIVED,) if include_archived else ())
+    for table, time_col, where in branches:
+        after_sql, after_params = keyset_clause(cursor, time_col, "t.id")
+        parts.append(
+            f"""
+            (SELECT t.id, t.title, t.description, u.username, t.status, {time_col} AS event_at
+             FROM {table} t
+             JOIN users u ON t.user_id = u.id
+             WHERE {where} {after_sql}
+             ORDER BY {time_col} DESC, t.id DESC
+             LIMIT %s)
+            """
+        )
+        params += [user_id, *after_params, page_size + 1]
+
+    declined_logs = [("ticket_responder_log", "tickets")]
+    if include_archived:
+        declined_logs.append(("ticket_responder_log_archive", "tickets_archive"))
+    for log_table, ticket_table in declined_logs:
+        after_sql, after_params = keyset_clause(cursor, "log.created_at", "log.ticket_id")
+        parts.append(
+            f"""
+            (SELECT t.id, t.title, t.description, u.username, 'declined', log.created_at AS event_at
+             FROM {log_table} log
+             JOIN {ticket_table} t ON log.ticket_id = t.id
+             JOIN users u ON t.user_id = u.id
+             WHERE log.responder_id = %s AND log.status = 'declined' {after_sql}
+             ORDER BY log.created_at DESC, log.ticket_id DESC
+             LIMIT %s)
+            """
+        )
+        params += [user_id, *after_params, page_size + 1]
+
+    cur.execute(
+        " UNION ALL ".join(parts) + " ORDER BY event_at DESC, id DESC LIMIT %s",
+        (*params, page_size + 1),
+    )
+    return split_page(cur.fetchall(), page_size, created_key=5, id_key=0)
+
+
+def _responder_summary(cur, user_id, include_archived=False):
+    """Per-status counts, answered from the covering indexes without reading rows."""
+    summary = {"done": 0, "in process": 0, "declined": 0}
+    cur.execute(
+        """
+        SELECT status, COUNT(*) FROM tickets
+        WHERE responder_id = %s AND status IN ('in process', 'done')
+        GROUP BY status
+        """,
+        (user_id,),
+    )
+    for status, n in cur.fetchall():
+        summary[status] += n
+
+    cur.execute(
+        "SELECT COUNT(*) FROM ticket_responder_log WHERE responder_id = %s AND status = 'declined'",
+        (user_id,),
+    )
+    summary["declined"] += cur.fetchone()[0]
+
+    if include_archived:
+        cur.execute(
+            "SELECT COUNT(*) FROM tickets_archive WHERE responder_id = %s AND status = 'done'",
+            (user_id,),
+        )
+        summary["done"] += cur.fetchone()[0]
+        cur.execute(
+            "SELECT COUNT(*) FROM ticket_responder_log_archive WHERE responder_id = %s AND status = 'declined'",
+            (user_id,),
+        )
+        summary["declined"] += cur.fetchone()[0]
+    return summary
+
+
 @bp.get("/dashboard")
 @login_required
 def dashboard():
@@ -30,45 +128,34 @@ def dashboard():
         user = cur.fetchone()
 
         # Tickets section differs by role (same as original)
-        if session.get("role") == "responder":
-            cur.execute(
-                """
-                SELECT t.id, t.title, t.description, u.username, t.status, t.created_at
-                FROM tickets t
-                JOIN users u ON t.user_id = u.id
-                WHERE t.responder_id = %s AND t.status = 'done'
-                ORDER BY t.created_at DESC
-                """,
-                (user_id,),
-            )
-            done_tickets = cur.fetchall()
+        include_archived = archived_requested()
 
-            cur.execute(
-                """
-                SELECT t.id, t.title, t.description, u.username, 'declined' AS status, log.created_at
-                FROM ticket_responder_log log
-                JOIN tickets t ON log.ticket_id = t.id
-                JOIN users u ON t.user_id = u.id
-                WHERE log.responder_id = %s AND log.status = 'declined'
-                ORDER BY log.created_at DESC
-                """,
-                (user_id,),
+        if session.get("role") == "responder":
+            cursor = decode_cursor(request.args.get("cursor"))
+            tickets, next_cursor = _responder_history(
+                cur, user_id, cursor, current_app.config["DASHBOARD_PAGE_SIZE"], include_archived
             )
-            declined_tickets = cur.fetchall()
-
-            tickets = done_tickets + declined_tickets
+            summary = _responder_summary(cur, user_id, include_archived)
         else:
-            cur.execute(
-                """
+            sql = """
                 SELECT id, title, description, status, created_at
                 FROM tickets
                 WHERE user_id = %s
                   AND status IN ('in process', 'done')
-                ORDER BY created_at DESC
-                """,
-                (user_id,),
+            """
+            if include_archived:
+                sql += """
+                UNION ALL
+                SELECT id, title, description, status, created_at
+                FROM tickets_archive
+                WHERE user_id = %s
+                """
+            cur.execute(
+                sql + " ORDER BY created_at DESC",
+                (user_id, user_id) if include_archived else (user_id,),
             )
             tickets = cur.fetchall()
+            next_cursor, summary, cursor = None, None, None
 
     # error handling for deactivate modal (same mapping as original)
     err = request.args.get("err")
@@ -82,6 +169,10 @@ def dashboard():
         "dashboard.html",
         user=user,
         tickets=tickets,
+        include_archived=include_archived,
+        next_cursor=next_cursor,
+        is_first_page=cursor is None,
+        summary=summary,
         deactivate_error=deactivate_error,
     )
 
@@ -171,6 +262,7 @@ def edit_account():
                 ),
             )
             cur.connection.commit()
+            user_profiles.delete(user_id)
             return redirect(url_for("account.dashboard"))
 
         # GET request
@@ -208,6 +300,7 @@ def delete_account():
 
         cur.execute("UPDATE users SET is_active=0 WHERE id=%s", (db_id,))
         cur.connection.commit()
+        user_profiles.delete(db_id)
 
     session.clear()
     return redirect(url_for("auth.login"))
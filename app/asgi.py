@@ -0,0 +1,373 @@
+"""
+ASGI serving mode (asgi.py), next to the WSGI one (wsgi.py).
+
+    uvicorn asgi:app --workers 2
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn asgi:app
+
+The same Flask app is built with create_app(). Requests whose endpoint has
+a native coroutine below are answered on the event loop:
+  - stream.stream            SSE feed; an open connection costs a task,
+                             not a worker thread
+  - users.api_users_search   typeahead, through the aiomysql pool
+                             (app/common/aiodb.py) when aiomysql is installed
+Every other request runs the regular blueprint view on a thread pool of
+ASGI_THREADS threads (WsgiBridge), so sessions, templates, after_request
+hooks and error pages behave exactly as under gunicorn / WSGI.
+ASGI_NATIVE_ROUTES=0 sends everything through the bridge.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl
+
+from itsdangerous import BadSignature
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_cookie
+from werkzeug.routing import RequestRedirect
+
+from . import create_app
+from .common.metrics import REQUEST_LATENCY
+from .extensions import aio_pool, event_bus
+from .stream.routes import channels_for, format_event
+from .users.routes import directory_args, directory_target, search_payload, search_users_query, split_users
+
+log = logging.getLogger(__name__)
+
+
+class _Disconnected(Exception):
+    """The client went away while a bridged response was still being produced."""
+
+
+# ---------------- WSGI bridge ----------------
+def _environ(scope, body):
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    root = scope.get("root_path", "")
+    path = scope["path"][len(root):] if root and scope["path"].startswith(root) else scope["path"]
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.input_terminated": True,  # fully buffered, so chunked uploads read to the end
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope["headers"]:
+        key = name.decode("latin-1").upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = "HTTP_" + key
+        value = value.decode("latin-1")
+        if key in environ:
+            environ[key] += ("; " if key == "HTTP_COOKIE" else ",") + value
+        else:
+            environ[key] = value
+    return environ
+
+
+async def _read_body(receive):
+    # request bodies above 1 MB (bulk provisioning uploads) spill to disk
+    body = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    more = True
+    while more:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise _Disconnected()
+        body.write(message.get("body", b""))
+        more = message.get("more_body", False)
+    body.seek(0)
+    return body
+
+
+class WsgiBridge:
+    """Runs a WSGI app on a thread pool behind ASGI, streaming its response back."""
+
+    def __init__(self, wsgi_app, threads):
+        self.wsgi_app = wsgi_app
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+
+    async def __call__(self, scope, receive, send):
+        try:
+            body = await _read_body(receive)
+        except _Disconnected:
+            return
+        environ = _environ(scope, body)
+        loop = asyncio.get_running_loop()
+        out = asyncio.Queue(maxsize=8)
+        gone = threading.Event()
+
+        def emit(item):
+            # blocks the worker thread while the client is slow (backpressure),
+            # gives up once the ASGI side has stopped reading
+            fut = asyncio.run_coroutine_threadsafe(out.put(item), loop)
+            while True:
+                try:
+                    return fut.result(timeout=1.0)
+                except concurrent.futures.TimeoutError:
+                    if gone.is_set():
+                        fut.cancel()
+                        raise _Disconnected()
+
+        def run():
+            status = []
+
+            def start_response(status_line, headers, exc_info=None):
+                if exc_info and status and status[0] is None:
+                    raise exc_info[1].with_traceback(exc_info[2])
+                status[:] = [status_line, headers]
+                return lambda data: send_body(data)
+
+            def send_start():
+                # PEP 3333: headers go out with the first body chunk (or at the end)
+                if status and status[0] is not None:
+                    emit(("start", status[0], status[1]))
+                    status[0] = None
+
+            def send_body(data):
+                if data:
+                    send_start()
+                    emit(("body", data))
+
+            try:
+                result = self.wsgi_app(environ, start_response)
+                try:
+                    for chunk in result:
+                        if gone.is_set():
+                            break
+                        send_body(chunk)
+                finally:
+                    if hasattr(result, "close"):
+                        result.close()
+                send_start()
+                emit(("end", None))
+            except _Disconnected:
+                pass
+            except Exception as e:
+                log.exception("unhandled error in bridged request %s %s", environ["REQUEST_METHOD"], environ["PATH_INFO"])
+                try:
+                    emit(("error", e))
+                except _Disconnected:
+                    pass
+
+        loop.run_in_executor(self.executor, run)
+
+        async def pump():
+            started = False
+            while True:
+                kind, *value = await out.get()
+                if kind == "start":
+                    status_line, headers = value
+                    await send({
+                        "type": "http.response.start",
+                        "status": int(status_line[:3]),
+                        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+                    })
+                    started = True
+                elif kind == "body":
+                    await send({"type": "http.response.body", "body": value[0], "more_body": True})
+                else:
+                    if kind == "error" and not started:
+                        await _plain(send, 500, "Internal Server Error")
+                    else:
+                        await send({"type": "http.response.body", "body": b"", "more_body": False})
+                    return
+
+        try:
+            # a closed tab (e.g. /stream with ASGI_NATIVE_ROUTES=0) stops the
+            # view at its next chunk instead of running to completion
+            await _until_disconnect(pump(), receive)
+        finally:
+            gone.set()
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+# ---------------- Native handlers ----------------
+async def _plain(send, status, text, content_type="text/plain; charset=utf-8", headers=()):
+    body = text.encode() if isinstance(text, str) else text
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _until_disconnect(coro, receive):
+    """Run coro, cancelling it as soon as the client disconnects."""
+    async def watch():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    task = asyncio.ensure_future(coro)
+    watcher = asyncio.ensure_future(watch())
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        task.cancel()
+        watcher.cancel()
+    if task.done() and not task.cancelled():
+        task.result()
+
+
+class AsgiApp:
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        cfg = flask_app.config
+        self.bridge = WsgiBridge(flask_app, cfg.get("ASGI_THREADS", 16))
+        self._urls = flask_app.url_map.bind("localhost")
+        flask_app.extensions["asgi"] = self
+
+        self.native = {}
+        if cfg.get("ASGI_NATIVE_ROUTES", True):
+            if str(cfg.get("LIVE_UPDATES", "auto")).lower() != "0":
+                self.native["stream.stream"] = self.stream
+            try:
+                import aiomysql  # noqa: F401  optional dependency
+                self.native["users.api_users_search"] = self.users_search
+            except ImportError:
+                log.warning("aiomysql is not installed; /api/users/search runs on the WSGI bridge")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return  # no websockets here
+
+        endpoint, handler = self._native_handler(scope)
+        if handler is None:
+            return await self.bridge(scope, receive, send)
+
+        started = time.perf_counter()
+        status = "500"
+        sent = {"start": False, "end": False}
+
+        async def tracked_send(message):
+            if message["type"] == "http.response.start":
+                sent["start"] = True
+            elif not message.get("more_body", False):
+                sent["end"] = True
+            await send(message)
+
+        try:
+            status = str(await handler(scope, receive, tracked_send))
+        except Exception:
+            log.exception("unhandled error in %s", endpoint)
+            if not sent["start"]:
+                await _plain(send, 500, "Internal Server Error")
+            elif not sent["end"]:
+                # headers are already out (e.g. a stream whose pub/sub subscribe failed): just end it
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            REQUEST_LATENCY.observe(endpoint, scope["method"], status, value=time.perf_counter() - started)
+
+    def _native_handler(self, scope):
+        if not self.native or scope["method"] != "GET":
+            return None, None
+        try:
+            endpoint, _args = self._urls.match(scope["path"], method="GET")
+        except (HTTPException, RequestRedirect):
+            return None, None
+        return endpoint, self.native.get(endpoint)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await aio_pool.close()
+                self.bridge.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def session(self, scope):
+        """The Flask session (read-only) from the request's session cookie."""
+        app = self.flask_app
+        cookies = b"; ".join(v for k, v in scope["headers"] if k == b"cookie").decode("latin-1")
+        value = parse_cookie(cookies).get(app.config["SESSION_COOKIE_NAME"])
+        serializer = app.session_interface.get_signing_serializer(app)
+        if not value or serializer is None:
+            return {}
+        try:
+            return serializer.loads(value, max_age=int(app.permanent_session_lifetime.total_seconds()))
+        except BadSignature:
+            return {}
+
+    # same contract as stream.routes.stream
+    async def stream(self, scope, receive, send):
+        session = self.session(scope)
+        if "user_id" not in session:
+            await _plain(send, 401, "")
+            return 401
+
+        cfg = self.flask_app.config
+        channels = channels_for(session["user_id"], session.get("role"))
+        heartbeat, max_seconds = cfg["SSE_HEARTBEAT_SECONDS"], cfg["SSE_MAX_SECONDS"]
+        loop = asyncio.get_running_loop()
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        })
+
+        async def pump():
+            deadline = loop.time() + max_seconds
+            with event_bus.subscribe_async(channels, loop) as sub:
+                await send({"type": "http.response.body", "body": b"retry: 3000\n\n", "more_body": True})
+                while loop.time() < deadline:
+                    message = await sub.next(heartbeat)
+                    chunk = ": keep-alive\n\n" if message is None else format_event(message)
+                    await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        await _until_disconnect(pump(), receive)
+        return 200
+
+    # same contract as users.routes.api_users_search
+    async def users_search(self, scope, receive, send):
+        session = self.session(scope)
+        if "user_id" not in session:
+            await _plain(send, 401, self.flask_app.json.dumps({"error": "unauthorized"}), "application/json")
+            return 401
+
+        args = MultiDict(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True))
+        q, org, active, after = directory_args(args)
+        limit = self.flask_app.config["USERS_PAGE_SIZE"]
+        sql, params = search_users_query(directory_target(session.get("role")), q, org, active, after, limit)
+        async with aio_pool.cursor(dict_cursor=True) as cur:
+            await cur.execute(sql, params)
+            rows = await cur.fetchall()
+
+        users, next_after = split_users(rows, limit)
+        await _plain(send, 200, self.flask_app.json.dumps(search_payload(users, next_after)), "application/json")
+        return 200
+
+
+def create_asgi_app(flask_app=None):
+    return AsgiApp(flask_app or create_app())
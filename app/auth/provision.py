@@ -0,0 +1,143 @@
+"""
+Bulk user provisioning (POST /api/users/provision for up to
+PROVISION_MAX_ROWS rows per request, flask provision-users for any size).
+
+Rows come as CSV (header = register form field names) or JSON lines and are
+validated with the same rules as /register. Password hashing, the expensive
+part, is spread over a process pool; valid rows are then inserted with
+multi-row INSERTs, one transaction per chunk. When a chunk hits a duplicate
+username / email it is rolled back and retried row by row, so one bad row
+only fails itself. The report lists every rejected row with its reason.
+"""
+import csv
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import MySQLdb
+from werkzeug.security import generate_password_hash
+
+from ..tickets import queue
+from .validation import INSERT_COLUMNS, validate_registration, insert_values
+
+_INSERT = (
+    f"INSERT INTO users ({', '.join(INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(INSERT_COLUMNS))})"
+)
+
+
+def parse_rows(text, fmt):
+    """CSV or JSONL text -> list of (line number, row dict | None, parse error | None)."""
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        return [(reader.line_num, row, None) for row in reader]
+
+    rows = []
+    for n, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            rows.append((n, None, f"Invalid JSON: {e}"))
+            continue
+        if not isinstance(row, dict):
+            rows.append((n, None, "Expected a JSON object."))
+            continue
+        rows.append((n, row, None))
+    return rows
+
+
+def _check_required(user):
+    # the register form enforces these in the browser; imported rows have no form
+    if not user["username"]:
+        return "Username is required."
+    if not user["password"]:
+        return "Password is required."
+    if user["role"] not in ("employee", "responder"):
+        return "Invalid role."
+    return None
+
+
+def _hash_all(passwords, workers):
+    if workers <= 1 or len(passwords) < 2:
+        return [generate_password_hash(p) for p in passwords]
+    # never fork: the caller may be a threaded gunicorn worker, and a forked
+    # child can inherit locks (logging, DB driver, cache) held by other threads
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        return list(pool.map(generate_password_hash, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def _insert_chunk(cur, chunk, errors):
+    """Insert one chunk in one transaction; returns the number of users created."""
+    try:
+        cur.executemany(_INSERT, [values for _line, _user, values in chunk])
+        inserted = chunk
+    except MySQLdb.IntegrityError:
+        # somebody in this chunk already exists: redo it row by row
+        cur.connection.rollback()
+        inserted = []
+        for line, user, values in chunk:
+            try:
+                cur.execute(_INSERT, values)
+                inserted.append((line, user, values))
+            except MySQLdb.IntegrityError as e:
+                errors.append({"line": line, "username": user["username"], "error": _integrity_message(e)})
+
+    responders = [user["username"] for _line, user, _values in inserted if user["role"] == "responder"]
+    if responders:
+        marks = ", ".join(["%s"] * len(responders))
+        cur.execute(f"SELECT id FROM users WHERE username IN ({marks})", responders)
+        queue.add_responders(cur, [r[0] for r in cur.fetchall()])
+
+    cur.connection.commit()
+    return len(inserted)
+
+
+def _integrity_message(exc):
+    text = str(exc)
+    if "uq_users_username" in text:
+        return "Username already exists."
+    if "uq_users_email" in text:
+        return "Email already exists."
+    return "Could not create user."
+
+
+def provision(cur, rows, workers=4, chunk_size=500):
+    """
+    `rows` as returned by parse_rows(). Returns
+    {"total", "created", "failed", "errors": [{"line", "username", "error"}]}.
+    """
+    errors = []
+    valid = []
+    seen = set()
+    for line, row, parse_error in rows:
+        if parse_error:
+            errors.append({"line": line, "username": None, "error": parse_error})
+            continue
+        user, error = validate_registration(row, require_confirmation="confirm_password" in row)
+        if not error:
+            error = _check_required(user)
+        if not error and user["username"] in seen:
+            error = "Duplicate username in import."
+        if error:
+            errors.append({"line": line, "username": (row.get("username") or "").strip() or None, "error": error})
+            continue
+        seen.add(user["username"])
+        valid.append((line, user))
+
+    hashes = _hash_all([user["password"] for _line, user in valid], workers)
+
+    created = 0
+    for i in range(0, len(valid), chunk_size):
+        chunk = [
+            (line, user, insert_values(user, pwd_hash))
+            for (line, user), pwd_hash in zip(valid[i:i + chunk_size], hashes[i:i + chunk_size])
+        ]
+        created += _insert_chunk(cur, chunk, errors)
+
+    errors.sort(key=lambda e: e["line"])
+    return {"total": len(rows), "created": created, "failed": len(errors), "errors": errors}
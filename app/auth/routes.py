@@ -1,36 +1,15 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session
-from werkzeug.security import generate_password_hash, check_password_hash
-import re
+import hmac
 
-import phonenumbers
-from phonenumbers.phonenumberutil import NumberParseException
+from flask import Blueprint, render_template, request, redirect, url_for, session, jsonify, current_app, abort
+from werkzeug.security import generate_password_hash, check_password_hash
 
 from ..common.db import get_cursor
+from ..extensions import user_profiles
+from ..tickets import queue
+from .validation import US_STATES, US_STATE_SET, validate_registration, insert_values  # noqa: F401 (re-exported)
 
 bp = Blueprint("auth", __name__)
 
-# ---------------- Register constants (same as original) ----------------
-US_STATES = [
-    ("AL", "Alabama"), ("AK", "Alaska"), ("AZ", "Arizona"), ("AR", "Arkansas"),
-    ("CA", "California"), ("CO", "Colorado"), ("CT", "Connecticut"),
-    ("DE", "Delaware"), ("FL", "Florida"), ("GA", "Georgia"),
-    ("HI", "Hawaii"), ("ID", "Idaho"), ("IL", "Illinois"), ("IN", "Indiana"),
-    ("IA", "Iowa"), ("KS", "Kansas"), ("KY", "Kentucky"), ("LA", "Louisiana"),
-    ("ME", "Maine"), ("MD", "Maryland"), ("MA", "Massachusetts"),
-    ("MI", "Michigan"), ("MN", "Minnesota"), ("MS", "Mississippi"),
-    ("MO", "Missouri"), ("MT", "Montana"), ("NE", "Nebraska"),
-    ("NV", "Nevada"), ("NH", "New Hampshire"), ("NJ", "New Jersey"),
-    ("NM", "New Mexico"), ("NY", "New York"), ("NC", "North Carolina"),
-    ("ND", "North Dakota"), ("OH", "Ohio"), ("OK", "Oklahoma"),
-    ("OR", "Oregon"), ("PA", "Pennsylvania"), ("RI", "Rhode Island"),
-    ("SC", "South Carolina"), ("SD", "South Dakota"), ("TN", "Tennessee"),
-    ("TX", "Texas"), ("UT", "Utah"), ("VT", "Vermont"),
-    ("VA", "Virginia"), ("WA", "Washington"),
-    ("WV", "West Virginia"), ("WI", "Wisconsin"), ("WY", "Wyoming")
-]
-US_STATE_SET = {abbr for abbr, _ in US_STATES}
-
-
 # ---------------- Login ----------------
 @bp.route("/login", methods=["GET", "POST"])
 def login():
@@ -80,59 +59,11 @@ def login():
 @bp.route("/register", methods=["GET", "POST"])
 def register():
     if request.method == "POST":
-        firstname = request.form.get("firstname", "").strip()
-        lastname = request.form.get("lastname", "").strip()
-        dob = request.form.get("dob", None)
-        username = request.form.get("username", "").strip()
-        email = request.form.get("email", "").strip()
-
-        address_line1 = request.form.get("address_line1", "").strip()
-        address_line2 = request.form.get("address_line2", "").strip()
-        city = request.form.get("city", "").strip()
-        state = request.form.get("state", "").strip()
-        zip_code = request.form.get("zip_code", "").strip()
-
-        phone_e164 = request.form.get("phone_e164", "").strip()
-        profession = request.form.get("profession", "").strip()
-        organization = request.form.get("organization", "").strip()
-        organization_other = request.form.get("organization_other", "").strip()
-
-        password = request.form.get("password", "")
-        confirm_password = request.form.get("confirm_password", "")
-        role = request.form.get("role", "").strip()
-
-        # --- Server-side validation (same messages as original) ---
-        if password != confirm_password:
-            return render_template("register.html", error="Passwords do not match.", states=US_STATES)
-
-        if state not in US_STATE_SET:
-            return render_template("register.html", error="Invalid state selected.", states=US_STATES)
-
-        if not re.match(r"^\d{5}(-\d{4})?$", zip_code):
-            return render_template("register.html", error="Invalid ZIP code.", states=US_STATES)
-
-        if organization == "Others" and not organization_other:
-            return render_template(
-                "register.html",
-                error="Please specify your organization (Others).",
-                states=US_STATES,
-            )
+        user, error = validate_registration(request.form)
+        if error:
+            return render_template("register.html", error=error, states=US_STATES)
 
-        if not phone_e164:
-            return render_template("register.html", error="Phone number is required.", states=US_STATES)
-
-        try:
-            parsed = phonenumbers.parse(phone_e164, None)
-            if not phonenumbers.is_valid_number(parsed):
-                return render_template("register.html", error="Invalid phone number.", states=US_STATES)
-            phone_e164 = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-        except NumberParseException:
-            return render_template("register.html", error="Invalid phone number format.", states=US_STATES)
-
-        if organization == "Others":
-            organization = organization_other.strip()
-
-        hashed_pwd = generate_password_hash(password)
+        hashed_pwd = generate_password_hash(user["password"])
 
         with get_cursor() as cur:
             cur.execute(
@@ -146,14 +77,10 @@ def register():
                 )
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """,
-                (
-                    firstname, lastname, dob,
-                    address_line1, address_line2, city, state, zip_code,
-                    username, email, phone_e164,
-                    hashed_pwd, role,
-                    profession, organization, organization_other,
-                ),
+                insert_values(user, hashed_pwd),
             )
+            if user["role"] == "responder":
+                queue.add_responder(cur, cur.lastrowid)
             cur.connection.commit()
 
         return redirect(url_for("auth.login"))
@@ -161,6 +88,36 @@ def register():
     return render_template("register.html", states=US_STATES)
 
 
+# ---------------- Bulk provisioning ----------------
+@bp.post("/api/users/provision")
+def provision_users():
+    # machine-to-machine endpoint: disabled unless PROVISION_TOKEN is set
+    token = current_app.config.get("PROVISION_TOKEN")
+    if not token:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()):
+        abort(401)
+
+    fmt = request.args.get("format") or ("csv" if request.mimetype == "text/csv" else "jsonl")
+    if fmt not in ("csv", "jsonl"):
+        return jsonify({"error": "format must be csv or jsonl"}), 400
+
+    from .provision import parse_rows, provision
+
+    rows = parse_rows(request.get_data(as_text=True), fmt)
+    max_rows = current_app.config["PROVISION_MAX_ROWS"]
+    if len(rows) > max_rows:
+        # hashing runs inside the request: keep it well under the worker timeout
+        return jsonify({"error": f"at most {max_rows} rows per request, use `flask provision-users` for more"}), 413
+    with get_cursor() as cur:
+        report = provision(
+            cur, rows,
+            workers=current_app.config["PROVISION_WORKERS"],
+            chunk_size=current_app.config["PROVISION_CHUNK_SIZE"],
+        )
+    return jsonify(report)
+
+
 # ---------------- Logout ----------------
 @bp.get("/logout")
 def logout():
@@ -211,6 +168,7 @@ def reactivate():
 
             cur.execute("UPDATE users SET is_active=1 WHERE id=%s", (user_id,))
             cur.connection.commit()
+            user_profiles.delete(user_id)
 
         session.pop("pending_reactivate", None)
         return redirect(url_for("auth.login"))
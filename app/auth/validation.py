@@ -0,0 +1,103 @@
+"""
+Registration rules shared by /register and bulk provisioning
+(app/auth/provision.py), so both accept and normalise exactly the same data.
+"""
+import re
+
+# ---------------- Register constants (same as original) ----------------
+US_STATES = [
+    ("AL", "Alabama"), ("AK", "Alaska"), ("AZ", "Arizona"), ("AR", "Arkansas"),
+    ("CA", "California"), ("CO", "Colorado"), ("CT", "Connecticut"),
+    ("DE", "Delaware"), ("FL", "Florida"), ("GA", "Georgia"),
+    ("HI", "Hawaii"), ("ID", "Idaho"), ("IL", "Illinois"), ("IN", "Indiana"),
+    ("IA", "Iowa"), ("KS", "Kansas"), ("KY", "Kentucky"), ("LA", "Louisiana"),
+    ("ME", "Maine"), ("MD", "Maryland"), ("MA", "Massachusetts"),
+    ("MI", "Michigan"), ("MN", "Minnesota"), ("MS", "Mississippi"),
+    ("MO", "Missouri"), ("MT", "Montana"), ("NE", "Nebraska"),
+    ("NV", "Nevada"), ("NH", "New Hampshire"), ("NJ", "New Jersey"),
+    ("NM", "New Mexico"), ("NY", "New York"), ("NC", "North Carolina"),
+    ("ND", "North Dakota"), ("OH", "Ohio"), ("OK", "Oklahoma"),
+    ("OR", "Oregon"), ("PA", "Pennsylvania"), ("RI", "Rhode Island"),
+    ("SC", "South Carolina"), ("SD", "South Dakota"), ("TN", "Tennessee"),
+    ("TX", "Texas"), ("UT", "Utah"), ("VT", "Vermont"),
+    ("VA", "Virginia"), ("WA", "Washington"),
+    ("WV", "West Virginia"), ("WI", "Wisconsin"), ("WY", "Wyoming")
+]
+US_STATE_SET = {abbr for abbr, _ in US_STATES}
+
+_ZIP = re.compile(r"^\d{5}(-\d{4})?$")
+
+# users columns written on registration, in insert_values() order
+INSERT_COLUMNS = (
+    "firstname", "lastname", "dob",
+    "address_line1", "address_line2", "city", "state", "zip_code",
+    "username", "email", "phone_e164",
+    "password", "role",
+    "profession", "organization", "organization_other",
+)
+
+
+def validate_registration(data, require_confirmation=True):
+    """
+    `data` is the register form (or one bulk-import row, any mapping).
+    Returns (user, None) with cleaned values, or (None, error message).
+    """
+    def field(name):
+        return str(data.get(name) or "").strip()
+
+    user = {
+        "firstname": field("firstname"),
+        "lastname": field("lastname"),
+        "dob": data.get("dob") or None,
+        "username": field("username"),
+        "email": field("email"),
+        "address_line1": field("address_line1"),
+        "address_line2": field("address_line2"),
+        "city": field("city"),
+        "state": field("state"),
+        "zip_code": field("zip_code"),
+        "phone_e164": field("phone_e164"),
+        "profession": field("profession"),
+        "organization": field("organization"),
+        "organization_other": field("organization_other"),
+        "password": data.get("password") or "",
+        "role": field("role"),
+    }
+
+    # --- Server-side validation (same messages as original) ---
+    if require_confirmation and user["password"] != (data.get("confirm_password") or ""):
+        return None, "Passwords do not match."
+
+    if user["state"] not in US_STATE_SET:
+        return None, "Invalid state selected."
+
+    if not _ZIP.match(user["zip_code"]):
+        return None, "Invalid ZIP code."
+
+    if user["organization"] == "Others" and not user["organization_other"]:
+        return None, "Please specify your organization (Others)."
+
+    if not user["phone_e164"]:
+        return None, "Phone number is required."
+
+    # phonenumbers loads large metadata tables: import on first registration, not at startup
+    import phonenumbers
+    from phonenumbers.phonenumberutil import NumberParseException
+
+    try:
+        parsed = phonenumbers.parse(user["phone_e164"], None)
+        if not phonenumbers.is_valid_number(parsed):
+            return None, "Invalid phone number."
+        user["phone_e164"] = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    except NumberParseException:
+        return None, "Invalid phone number format."
+
+    if user["organization"] == "Others":
+        user["organization"] = user["organization_other"]
+
+    return user, None
+
+
+def insert_values(user, password_hash):
+    """Parameters for an INSERT INTO users (INSERT_COLUMNS) VALUES (...)."""
+    return tuple(password_hash if col == "password" else user[col] for col in INSERT_COLUMNS)
@@ -0,0 +1,159 @@
+import time
+
+import click
+from flask import current_app
+
+from .common.db import get_cursor
+from .extensions import db_pool, static_assets
+
+
+def init_app(app):
+    app.cli.add_command(generate_data)
+    app.cli.add_command(archive_tickets)
+    app.cli.add_command(profile_startup)
+    app.cli.add_command(provision_users)
+    app.cli.add_command(build_static)
+
+
+@click.command("generate-data")
+@click.option("--users", default=10000, show_default=True, type=click.IntRange(min=2),
+              help="At least one employee and one responder.")
+@click.option("--tickets", default=100000, show_default=True)
+@click.option("--messages", default=200000, show_default=True)
+@click.option("--responder-ratio", default=0.1, show_default=True, help="Share of users that are responders.")
+@click.option("--declined-rate", default=0.15, show_default=True,
+              help="Share of open tickets declined by 1-3 responders.")
+@click.option("--days", default=365, show_default=True, help="Spread ticket and message history over this many days.")
+@click.option("--workers", default=4, show_default=True, help="Parallel generator/loader processes.")
+@click.option("--batch", default=5000, show_default=True, help="Rows per INSERT / LOAD DATA chunk.")
+@click.option("--mode", type=click.Choice(["insert", "infile"]), default="insert", show_default=True,
+              help="Multi-row INSERTs, or LOAD DATA LOCAL INFILE from streamed TSV files.")
+@click.option("--seed", default=42, show_default=True)
+@click.option("--now", type=click.DateTime(), help="End of the generated history (default: current time); "
+              "with the same --seed and volumes it reproduces a run.")
+@click.option("--prefix", default="gen", show_default=True, help="Username prefix of generated accounts.")
+@click.option("--password", default="password123", show_default=True)
+def generate_data(**opts):
+    """Bulk-load synthetic users, tickets, declines, events and messages."""
+    from .datagen import generate
+
+    counts = generate(db_pool.connect_kwargs, log=click.echo, **opts)
+    click.echo(f"done: {sum(counts.values())} rows")
+
+
+@click.command("archive-tickets")
+@click.option("--older-than-days", type=int, help="Default: ARCHIVE_AFTER_DAYS.")
+@click.option("--batch-size", type=int, help="Tickets per transaction. Default: ARCHIVE_BATCH_SIZE.")
+@click.option("--pause", type=float, help="Seconds between batches. Default: ARCHIVE_BATCH_PAUSE.")
+@click.option("--max-batches", type=int, help="Stop after this many batches (default: until done).")
+def archive_tickets(older_than_days, batch_size, pause, max_batches):
+    """Move old done tickets (with their declines and events) into the archive tables."""
+    from .tickets.archive import archive_done
+
+    cfg = current_app.config
+    with get_cursor() as cur:
+        total = archive_done(
+            cur,
+            older_than_days if older_than_days is not None else cfg["ARCHIVE_AFTER_DAYS"],
+            batch_size=batch_size or cfg["ARCHIVE_BATCH_SIZE"],
+            pause=pause if pause is not None else cfg["ARCHIVE_BATCH_PAUSE"],
+            max_batches=max_batches,
+            log=click.echo,
+        )
+    click.echo(f"archived {total} tickets")
+
+
+@click.command("provision-users")
+@click.argument("source", type=click.File("r", encoding="utf-8"))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="Default: from the file extension.")
+@click.option("--workers", type=int, help="Password hashing processes. Default: PROVISION_WORKERS.")
+@click.option("--chunk-size", type=int, help="Rows per INSERT transaction. Default: PROVISION_CHUNK_SIZE.")
+@click.option("--report", type=click.File("w"), help="Write the full JSON report here.")
+def provision_users(source, fmt, workers, chunk_size, report):
+    """Create users from a CSV / JSONL file with the /register validation rules."""
+    from .auth.provision import parse_rows, provision
+
+    fmt = fmt or ("csv" if source.name.endswith(".csv") else "jsonl")
+    cfg = current_app.config
+    started = time.monotonic()
+    with get_cursor() as cur:
+        result = provision(
+            cur, parse_rows(source.read(), fmt),
+            workers=workers or cfg["PROVISION_WORKERS"],
+            chunk_size=chunk_size or cfg["PROVISION_CHUNK_SIZE"],
+        )
+
+    for err in result["errors"][:20]:
+        click.echo(f"line {err['line']} ({err['username'] or '-'}): {err['error']}", err=True)
+    if result["failed"] > 20:
+        click.echo(f"... {result['failed'] - 20} more", err=True)
+    if report:
+        import json
+        json.dump(result, report, indent=2)
+    click.echo(
+        f"{result['created']} created, {result['failed']} failed of {result['total']} "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+
+
+@click.command("build-static")
+@click.option("--clean", is_flag=True, help="Also delete outputs of previous builds.")
+def build_static(clean):
+    """Fingerprint and precompress app/static into STATIC_BUILD_DIR (run once per deploy)."""
+    if not static_assets.enabled:
+        raise click.ClickException("STATIC_FINGERPRINT is off")
+    # create_app() already ran the build; this reports it
+    click.echo(f"{len(static_assets.manifest)} files, {static_assets.written} written to {static_assets.build_dir}")
+    if clean:
+        click.echo(f"{static_assets.clean()} stale files removed")
+
+
+# runs in a fresh interpreter so nothing is already imported
+_STARTUP_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+resp = app.test_client().get(sys.argv[1])
+t3 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "create_app_s": t2 - t1, "first_request_s": t3 - t2, "status": resp.status_code}))
+"""
+
+
+@click.command("profile-startup")
+@click.option("--path", default="/", show_default=True, help="URL of the first request.")
+@click.option("--top", default=25, show_default=True, help="Slowest modules to list.")
+def profile_startup(path, top):
+    """Per-module import time (-X importtime) and time to first request, in a fresh process."""
+    import json
+    import subprocess
+    import sys
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STARTUP_PROBE, path],
+        capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise click.ClickException(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "probe failed")
+
+    # "import time:  self [us] | cumulative | imported package"
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative_us), int(self_us), name.rstrip()))
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    click.echo(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(modules, reverse=True)[:top]:
+        click.echo(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+    click.echo("")
+    click.echo(f"import app:       {timings['import_s'] * 1000:8.1f} ms ({len(modules)} modules)")
+    click.echo(f"create_app():     {timings['create_app_s'] * 1000:8.1f} ms")
+    click.echo(f"first request:    {timings['first_request_s'] * 1000:8.1f} ms (GET {path} -> {timings['status']})")
+    click.echo(f"process total:    {wall * 1000:8.1f} ms")
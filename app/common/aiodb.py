@@ -0,0 +1,79 @@
+"""
+asyncio MySQL pool for the native handlers of the ASGI entry point
+(asgi.py / app/asgi.py).
+
+Same database, credentials and charset as the sync ConnectionPool; the
+pool itself is created lazily inside the running event loop (so it is
+per worker process and survives a preloading master) with up to
+ASYNC_DB_POOL_SIZE connections. Needs the optional `aiomysql` package;
+WSGI deployments never import it.
+
+    async with aio_pool.cursor(dict_cursor=True) as cur:
+        await cur.execute(sql, params)
+        rows = await cur.fetchall()
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class AsyncPool:
+    def __init__(self):
+        self._pool = None
+        self._lock = None
+        self._settings = {}
+
+        self._checkouts = 0
+
+    def init_app(self, app):
+        cfg = app.config
+        self._settings = dict(
+            host=cfg.get("MYSQL_HOST") or "localhost",
+            user=cfg.get("MYSQL_USER") or "",
+            password=cfg.get("MYSQL_PASSWORD") or "",
+            db=cfg.get("MYSQL_DB") or "",
+            port=cfg.get("MYSQL_PORT", 3306),
+            charset=cfg.get("MYSQL_CHARSET", "utf8"),
+            connect_timeout=cfg.get("DB_CONNECT_TIMEOUT", 10),
+            minsize=cfg.get("ASYNC_DB_POOL_MIN", 1),
+            maxsize=cfg.get("ASYNC_DB_POOL_SIZE", 20),
+            pool_recycle=int(cfg.get("DB_POOL_IDLE_TIMEOUT", 300)),
+            autocommit=True,
+        )
+        app.extensions["aio_pool"] = self
+
+    async def _get_pool(self):
+        if self._pool is None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._pool is None:
+                    import aiomysql  # optional dependency, only needed by asgi.py
+
+                    self._pool = await aiomysql.create_pool(**self._settings)
+        return self._pool
+
+    @asynccontextmanager
+    async def cursor(self, dict_cursor=False):
+        import aiomysql
+
+        pool = await self._get_pool()
+        self._checkouts += 1
+        async with pool.acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor if dict_cursor else aiomysql.Cursor) as cur:
+                yield cur
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    # ---------------- Stats ----------------
+    def stats(self):
+        pool = self._pool
+        return {
+            "open": pool.size if pool is not None else 0,
+            "idle": pool.freesize if pool is not None else 0,
+            "max": self._settings.get("maxsize"),
+            "checkouts": self._checkouts,
+        }
@@ -0,0 +1,185 @@
+"""
+Fingerprinted, precompressed static files.
+
+At startup (or ahead of time with `flask build-static`) every file under
+app/static is content-hashed and copied to STATIC_BUILD_DIR as
+`name.<hash>.ext`; text assets also get `.gz` and, when the optional
+`brotli` package is installed, `.br` siblings. `url_for('static',
+filename='style.css')` is rewritten to the hashed name, and hashed names
+are served with a one-year `immutable` Cache-Control and the best encoding
+the client accepts, so a page navigation never revalidates them.
+
+Output files are content-addressed: a worker finding one already present
+skips it, and files from the previous deploy stay servable to pages that
+still reference them (`flask build-static --clean` removes them).
+Unhashed names (/static/style.css) keep Flask's default handling.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+_COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt", ".html", ".map")
+IMMUTABLE = "public, max-age=31536000, immutable"
+# name.<12 hex digits>.ext, as written by build()
+_HASHED = re.compile(r"^(?P<stem>.+)\.[0-9a-f]{12}(?P<ext>\.[^./]+)?$")
+
+
+def _digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            h.update(block)
+    return h.hexdigest()[:12]
+
+
+def _write(path, data):
+    # temp file + rename: concurrent workers never see a half-written asset
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class StaticAssets:
+    def __init__(self):
+        self.enabled = False
+        self.build_dir = None
+        self.manifest = {}  # "style.css" -> "style.<hash>.css"
+        self._sources = {}  # hashed name -> original name
+        self._encodings = {}  # hashed name -> {"br", "gzip"} variants on disk
+        self._lock = threading.Lock()
+
+        self.written = 0
+        self._served = {"br": 0, "gzip": 0, "identity": 0}
+
+    def init_app(self, app):
+        self.enabled = app.config.get("STATIC_FINGERPRINT", True)
+        if not self.enabled or not app.static_folder:
+            return
+        self.build_dir = app.config.get("STATIC_BUILD_DIR") or os.path.join(app.instance_path, "static")
+        self.written = self.build(app.static_folder, level=app.config.get("STATIC_COMPRESS_LEVEL", 9))
+
+        app.extensions["static_assets"] = self
+        app.url_defaults(self._fingerprint)
+        fallback = app.view_functions["static"]
+        app.view_functions["static"] = lambda filename: self.serve(filename) or fallback(filename=filename)
+
+    # ---------------- Build ----------------
+    def build(self, source_dir, level=9):
+        """Hash, copy and precompress everything under source_dir. Returns files written."""
+        os.makedirs(self.build_dir, exist_ok=True)
+        try:
+            import brotli  # optional dependency, .br variants are skipped without it
+        except ImportError:
+            brotli = None
+
+        written = 0
+        for root, _dirs, files in os.walk(source_dir):
+            for name in files:
+                src = os.path.join(root, name)
+                rel = os.path.relpath(src, source_dir).replace(os.sep, "/")
+                stem, ext = os.path.splitext(rel)
+                hashed = f"{stem}.{_digest(src)}{ext}"
+                out = os.path.join(self.build_dir, *hashed.split("/"))
+
+                encodings = set()
+                if not os.path.exists(out):
+                    os.makedirs(os.path.dirname(out), exist_ok=True)
+                    with open(src, "rb") as f:
+                        data = f.read()
+                    _write(out, data)
+                    written += 1
+                    if ext.lower() in _COMPRESSIBLE:
+                        variants = [(".gz", lambda d: gzip.compress(d, compresslevel=level, mtime=0))]
+                        if brotli is not None:
+                            variants.append((".br", lambda d: brotli.compress(d, quality=min(level + 2, 11))))
+                        for suffix, compress in variants:
+                            packed = compress(data)
+                            if len(packed) < len(data):
+                                _write(out + suffix, packed)
+                                written += 1
+                if os.path.exists(out + ".gz"):
+                    encodings.add("gzip")
+                if os.path.exists(out + ".br"):
+                    encodings.add("br")
+
+                self.manifest[rel] = hashed
+                self._sources[hashed] = rel
+                self._encodings[hashed] = encodings
+        return written
+
+    def clean(self):
+        """Delete build outputs that the current manifest no longer references."""
+        keep = set()
+        for hashed in self._sources:
+            path = os.path.join(self.build_dir, *hashed.split("/"))
+            keep.update((path, path + ".gz", path + ".br"))
+        removed = 0
+        for root, _dirs, files in os.walk(self.build_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if path not in keep:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    # ---------------- URLs ----------------
+    def _fingerprint(self, endpoint, values):
+        if endpoint == "static":
+            hashed = self.manifest.get(values.get("filename"))
+            if hashed is not None:
+                values["filename"] = hashed
+
+    # ---------------- Serving ----------------
+    def serve(self, filename):
+        """Response for a hashed name, or None to fall back to the default static view."""
+        source = self._sources.get(filename)
+        if source is not None:
+            available = self._encodings.get(filename, ())
+        else:
+            # a previous deploy's output, still referenced by pages (or 304s) cached in browsers
+            source, available = self._previous(filename)
+            if source is None:
+                return None
+
+        accepted = request.accept_encodings
+        encoding = next((e for e in ("br", "gzip") if e in available and accepted.quality(e) > 0), None)
+
+        mimetype = mimetypes.guess_type(source)[0] or "application/octet-stream"
+        name = filename + {"br": ".br", "gzip": ".gz"}.get(encoding, "")
+        resp = send_from_directory(self.build_dir, name, mimetype=mimetype, max_age=31536000)
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+        if available:
+            resp.vary.add("Accept-Encoding")
+        resp.headers["Cache-Control"] = IMMUTABLE
+
+        with self._lock:
+            self._served[encoding or "identity"] += 1
+        return resp
+
+    def _previous(self, filename):
+        match = _HASHED.match(filename)
+        path = safe_join(self.build_dir, filename) if match else None
+        if path is None or not os.path.isfile(path):
+            return None, ()
+        available = {e for e, suffix in (("gzip", ".gz"), ("br", ".br")) if os.path.isfile(path + suffix)}
+        return match["stem"] + (match["ext"] or ""), available
+
+    # ---------------- Stats ----------------
+    def stats(self):
+        with self._lock:
+            served = dict(self._served)
+        return {
+            "files": len(self.manifest),
+            "precompressed": sum(1 for e in self._encodings.values() if e),
+            "served_br": served["br"],
+            "served_gzip": served["gzip"],
+            "served_identity": served["identity"],
+        }
@@ -0,0 +1,196 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalBackend:
+    """In-process LRU cache with a per-entry TTL (one per worker process)."""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def incr(self, key, delta):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                return None
+            value = item[1] + delta
+            self._data[key] = (item[0], value)
+            return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisBackend:
+    """Shared backend so every gunicorn worker sees the same values."""
+
+    # INCRBY would create missing keys; a miss must stay a miss so the
+    # next read falls back to the database.
+    _INCR_IF_EXISTS = """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return redis.call('INCRBY', KEYS[1], ARGV[1])
+    end
+    return nil
+    """
+
+    def __init__(self, url, namespace, loads=int, dumps=str):
+        import redis  # optional dependency, only needed when CACHE_URL is set
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = f"tms:{namespace}:"
+        self._incr = self._client.register_script(self._INCR_IF_EXISTS)
+        self._loads = loads
+        self._dumps = dumps
+
+    def get(self, key):
+        value = self._client.get(self._prefix + str(key))
+        return None if value is None else self._loads(value)
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        values = self._client.mget([self._prefix + str(k) for k in keys])
+        return [None if v is None else self._loads(v) for v in values]
+
+    def set(self, key, value, ttl):
+        self._client.set(self._prefix + str(key), self._dumps(value), ex=max(1, int(ttl)))
+
+    def incr(self, key, delta):
+        value = self._incr(keys=[self._prefix + str(key)], args=[delta])
+        return None if value is None else int(value)
+
+    def delete(self, key):
+        self._client.delete(self._prefix + str(key))
+
+    def __len__(self):
+        return 0
+
+
+class _NamespacedCache:
+    """
+    Values cached per key under one namespace.
+
+    Uses the shared backend from CACHE_URL (redis://...) when configured,
+    otherwise an in-process LRU. Config keys are namespaced, e.g.
+    UNREAD_CACHE_SIZE / UNREAD_CACHE_TTL for namespace "unread".
+    """
+
+    # how values are stored in redis
+    loads = staticmethod(int)
+    dumps = staticmethod(str)
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.ttl = 60
+        self.backend = LocalBackend()
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        prefix = self.namespace.upper()
+        self.ttl = app.config.get(f"{prefix}_CACHE_TTL", 60)
+        url = app.config.get("CACHE_URL")
+        if url:
+            self.backend = RedisBackend(url, self.namespace, self.loads, self.dumps)
+        else:
+            self.backend = LocalBackend(app.config.get(f"{prefix}_CACHE_SIZE", 10000))
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_many(self, keys):
+        values = self.backend.get_many(list(keys))
+        found = sum(1 for v in values if v is not None)
+        self.hits += found
+        self.misses += len(values) - found
+        return values
+
+    def set(self, key, value):
+        self.backend.set(key, value, self.ttl)
+
+    def delete(self, key):
+        self.backend.delete(key)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.backend)}
+
+
+class CounterCache(_NamespacedCache):
+    """Integer counters cached per key, e.g. unread messages per user."""
+
+    def incr(self, key, delta=1):
+        """Adjust a cached counter; missing keys stay missing."""
+        value = self.backend.incr(key, delta)
+        if value is not None and value < 0:
+            # drifted (e.g. a stale worker-local entry): recount on next read
+            self.backend.delete(key)
+            return None
+        return value
+
+
+class ObjectCache(_NamespacedCache):
+    """
+    JSON-serialisable values cached per key, e.g. user profiles.
+
+    Invalidation (delete) only reaches every worker through a shared
+    backend, so <NAMESPACE>_CACHE=auto (default) caches only when CACHE_URL
+    is set; 1 forces the in-process LRU (single-process deployments), 0
+    turns caching off. While off, get() always misses and set() is a no-op.
+    """
+
+    loads = staticmethod(json.loads)
+    dumps = staticmethod(json.dumps)
+
+    def __init__(self, namespace):
+        super().__init__(namespace)
+        self.enabled = False
+
+    def init_app(self, app):
+        super().init_app(app)
+        setting = str(app.config.get(f"{self.namespace.upper()}_CACHE", "auto")).lower()
+        self.enabled = bool(app.config.get("CACHE_URL")) if setting == "auto" else setting == "1"
+
+    def get(self, key):
+        return super().get(key) if self.enabled else None
+
+    def get_many(self, keys):
+        return super().get_many(keys) if self.enabled else [None] * len(list(keys))
+
+    def set(self, key, value):
+        if self.enabled:
+            super().set(key, value)
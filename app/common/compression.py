@@ -0,0 +1,137 @@
+"""
+Response compression (gzip, and brotli when the optional `brotli` package
+is installed), negotiated on Accept-Encoding.
+
+Only responses whose mimetype is in COMPRESS_MIMETYPES and whose body is at
+least COMPRESS_MIN_SIZE bytes are compressed; a result that is not smaller
+is thrown away. Streamed responses are compressed chunk by chunk with a
+sync flush, so every chunk still reaches the client as soon as it is
+produced. Responses that already carry a Content-Encoding (precompressed
+static files), file passthroughs, partial content, `no-transform`, and
+bodiless statuses (204 / 304) are left alone. text/event-stream is not in
+the default allowlist: proxies tend to buffer compressed SSE.
+
+Bytes in / out and the per-response ratio are exported on /metrics.
+"""
+import gzip
+import zlib
+
+from flask import request
+
+from .metrics import COMPRESS_BYTES_IN, COMPRESS_BYTES_OUT, COMPRESS_RATIO
+
+
+class Compressor:
+    def __init__(self):
+        self.enabled = False
+        self.min_size = 500
+        self.mimetypes = set()
+        self.level = 6
+        self.br_quality = 4
+        self._brotli = None
+
+    def init_app(self, app):
+        cfg = app.config
+        self.enabled = cfg.get("COMPRESS_ENABLED", True)
+        if not self.enabled:
+            return
+        self.min_size = cfg.get("COMPRESS_MIN_SIZE", 500)
+        self.mimetypes = {m.strip() for m in cfg.get("COMPRESS_MIMETYPES", "text/html").split(",") if m.strip()}
+        self.level = cfg.get("COMPRESS_LEVEL", 6)
+        self.br_quality = cfg.get("COMPRESS_BR_QUALITY", 4)
+        try:
+            import brotli  # optional dependency, gzip only without it
+            self._brotli = brotli
+        except ImportError:
+            self._brotli = None
+
+        app.extensions["compressor"] = self
+        # after_request handlers run in reverse order: register this one
+        # first so it sees the final body
+        app.after_request(self._compress)
+
+    # ---------------- Negotiation ----------------
+    def _encoding(self):
+        accepted = request.accept_encodings
+        offered = ("br", "gzip") if self._brotli is not None else ("gzip",)
+        best = max(offered, key=lambda e: accepted.quality(e))  # ties keep br
+        return best if accepted.quality(best) > 0 else None
+
+    def _eligible(self, response):
+        if response.mimetype not in self.mimetypes:
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304) or request.method == "HEAD":
+            return False
+        if "Content-Encoding" in response.headers or response.direct_passthrough:
+            return False
+        return not response.cache_control.no_transform
+
+    # ---------------- Compression ----------------
+    def _compress(self, response):
+        if not self._eligible(response):
+            return response
+        # the body depends on Accept-Encoding even when this client gets identity
+        response.vary.add("Accept-Encoding")
+        encoding = self._encoding()
+        if encoding is None:
+            return response
+
+        endpoint = request.endpoint or "<unmatched>"
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding, endpoint)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            packed = self._pack(data, encoding)
+            if len(packed) >= len(data):
+                return response
+            response.set_data(packed)
+            self._observe(endpoint, encoding, len(data), len(packed))
+
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # the bytes changed, so a strong validator no longer holds
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _pack(self, data, encoding):
+        if encoding == "br":
+            return self._brotli.compress(data, quality=self.br_quality)
+        return gzip.compress(data, compresslevel=self.level)
+
+    def _stream(self, chunks, encoding, endpoint):
+        if encoding == "br":
+            comp = self._brotli.Compressor(quality=self.br_quality)
+            compress, flush, finish = comp.process, comp.flush, comp.finish
+        else:
+            comp = zlib.compressobj(self.level, zlib.DEFLATED, 31)  # 31: gzip container
+            compress, flush, finish = comp.compress, lambda: comp.flush(zlib.Z_SYNC_FLUSH), comp.flush
+
+        size_in = size_out = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                if not chunk:
+                    continue
+                out = compress(chunk) + flush()
+                size_in += len(chunk)
+                size_out += len(out)
+                yield out
+            out = finish()
+            size_out += len(out)
+            yield out
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+            if size_in:
+                self._observe(endpoint, encoding, size_in, size_out)
+
+    @staticmethod
+    def _observe(endpoint, encoding, size_in, size_out):
+        COMPRESS_BYTES_IN.inc(endpoint, encoding, amount=size_in)
+        COMPRESS_BYTES_OUT.inc(endpoint, encoding, amount=size_out)
+        COMPRESS_RATIO.observe(endpoint, encoding, value=size_out / size_in)
@@ -1,23 +1,107 @@
+import re
+import time
+from collections import namedtuple
 from contextlib import contextmanager
-from ..extensions import mysql
+from functools import lru_cache
+
+from flask import g, has_app_context
+from MySQLdb.cursors import Cursor, DictCursor
+
+from ..extensions import db_pool, db_replicas
+from . import diagnostics
+from .metrics import QUERY_LATENCY, QUERY_ROWS
+
+_WS = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+\b")
+_READ_ONLY = re.compile(r"\s*\(?\s*(SELECT|SHOW|EXPLAIN|SET)\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """Whitespace-collapsed SQL with literals replaced by '?', used as a metric label."""
+    return _LITERALS.sub("?", _WS.sub(" ", sql).strip())[:200]
+
+
+@lru_cache(maxsize=256)
+def _row_type(columns):
+    # rename=True: aliases like COUNT(*) become _0, _1, ...
+    return namedtuple("Row", columns, rename=True)
+
+
+class NamedTupleCursor(Cursor):
+    """Buffered cursor returning namedtuples: row.title as well as row[1]."""
+
+    def _post_get_result(self):
+        super()._post_get_result()
+        if self._rows and self.description:
+            row = _row_type(tuple(d[0] for d in self.description))
+            self._rows = tuple(row._make(r) for r in self._rows)
+
+
+class InstrumentedCursor:
+    """
+    Thin proxy over a MySQLdb cursor that times every execute()/executemany()
+    and counts rows, per SQL fingerprint and per request. Everything else
+    (fetchall, rowcount, lastrowid, connection.commit(), ...) is delegated.
+    """
+
+    __slots__ = ("_cur",)
+
+    def __init__(self, cur):
+        self._cur = cur
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def _timed(self, method, query, args):
+        started = time.perf_counter()
+        try:
+            return method(query, args)
+        finally:
+            elapsed = time.perf_counter() - started
+            fp = fingerprint(query)
+            rows = self._cur.rowcount
+            QUERY_LATENCY.observe(fp, value=elapsed)
+            QUERY_ROWS.inc(fp, amount=max(rows or 0, 0))
+            if diagnostics.enabled():
+                diagnostics.capture(fp, query, args, elapsed, rows, self._cur.connection)
+            if has_app_context():
+                if not _READ_ONLY.match(query):
+                    g._db_wrote = True  # read-your-writes stickiness (common/replicas.py)
+                g._db_queries = g.get("_db_queries", 0) + 1
+                g._db_seconds = g.get("_db_seconds", 0.0) + elapsed
+
+    def execute(self, query, args=None):
+        return self._timed(self._cur.execute, query, args)
+
+    def executemany(self, query, args):
+        return self._timed(self._cur.executemany, query, args)
+
 
 @contextmanager
-def get_cursor(dict_cursor: bool = False):
+def get_cursor(dict_cursor: bool = False, readonly: bool = False, namedtuple_cursor: bool = False):
     """
     Usage:
         with get_cursor() as cur:
             cur.execute(...)
             rows = cur.fetchall()
 
-    dict_cursor=True returns dict rows if your MySQL driver supports it.
+    dict_cursor=True returns rows as dicts keyed by column name / alias,
+    namedtuple_cursor=True as namedtuples (attribute and index access).
+    readonly=True may route to a read replica (see common/replicas.py);
+    only use it for blocks that never write.
+
+    The connection comes from the pool and stays bound to the current
+    request, so several get_cursor() blocks in one request share it.
     """
     cur = None
     try:
-        if dict_cursor:
-            cur = mysql.connection.cursor()  # adjust if you later switch cursor types
-        else:
-            cur = mysql.connection.cursor()
-        yield cur
+        conn = db_replicas.connection() if readonly else db_pool.connection()
+        cur = conn.cursor(DictCursor if dict_cursor else NamedTupleCursor if namedtuple_cursor else Cursor)
+        yield InstrumentedCursor(cur)
     finally:
         if cur is not None:
             cur.close()
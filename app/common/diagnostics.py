@@ -0,0 +1,153 @@
+"""
+Slow-query / N+1 diagnostic mode (DB_DIAGNOSTICS=1).
+
+Every statement run through get_cursor() is logged on the request. When
+the request finishes it is checked against the budgets below; requests
+that break one get a JSON line appended to DB_DIAG_REPORT_PATH, with
+EXPLAIN output captured for the offending SELECTs:
+
+- DB_DIAG_MAX_QUERIES        statements per request
+- DB_DIAG_MAX_DB_MS          total SQL time per request
+- DB_DIAG_SLOW_QUERY_MS      single statement time
+- DB_DIAG_REPEAT_THRESHOLD   same fingerprint run this many times (N+1),
+                             or the identical statement + args repeated
+
+Meant for staging / short production windows: it keeps the arguments of
+every statement in memory for the duration of the request.
+"""
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from flask import g, request, has_request_context
+from MySQLdb.cursors import DictCursor
+
+log = logging.getLogger(__name__)
+
+_settings = {"enabled": False}
+_write_lock = threading.Lock()
+
+
+def init_app(app):
+    cfg = app.config
+    _settings.update(
+        enabled=cfg.get("DB_DIAGNOSTICS", False),
+        max_queries=cfg.get("DB_DIAG_MAX_QUERIES", 20),
+        max_db_ms=cfg.get("DB_DIAG_MAX_DB_MS", 250.0),
+        slow_query_ms=cfg.get("DB_DIAG_SLOW_QUERY_MS", 100.0),
+        repeat_threshold=cfg.get("DB_DIAG_REPEAT_THRESHOLD", 3),
+        report_path=cfg.get("DB_DIAG_REPORT_PATH", "db_diagnostics.jsonl"),
+        explain=cfg.get("DB_DIAG_EXPLAIN", True),
+    )
+    if _settings["enabled"]:
+        app.after_request(_check_request)
+
+
+def enabled():
+    return _settings["enabled"]
+
+
+def capture(fingerprint, query, args, elapsed, rows, conn):
+    """Called by InstrumentedCursor for every statement while diagnostics are on."""
+    if not has_request_context():
+        return
+    # conn (primary or replica) stays checked out until the app context ends,
+    # so _explain() can still use it from after_request
+    g.setdefault("_db_log", []).append((fingerprint, query, args, elapsed * 1000, rows, conn))
+
+
+def _repeat_key(args):
+    try:
+        return json.dumps(args, default=str, sort_keys=True)
+    except TypeError:
+        return repr(args)
+
+
+def analyze(entries):
+    """Returns (violations, offending fingerprints) for one request's statement log."""
+    s = _settings
+    violations = []
+    offenders = set()
+
+    total_ms = sum(e[3] for e in entries)
+    if len(entries) > s["max_queries"]:
+        violations.append({"kind": "query_count", "value": len(entries), "budget": s["max_queries"]})
+    if total_ms > s["max_db_ms"]:
+        violations.append({"kind": "db_time", "value_ms": round(total_ms, 3), "budget_ms": s["max_db_ms"]})
+
+    by_fp = defaultdict(list)
+    identical = defaultdict(int)
+    for fp, query, args, ms, _rows, _conn in entries:
+        by_fp[fp].append(ms)
+        identical[(fp, _repeat_key(args))] += 1
+        if ms > s["slow_query_ms"]:
+            violations.append({"kind": "slow_query", "fingerprint": fp, "value_ms": round(ms, 3)})
+            offenders.add(fp)
+
+    for fp, times in by_fp.items():
+        if len(times) >= s["repeat_threshold"]:
+            violations.append({"kind": "n_plus_one", "fingerprint": fp, "count": len(times)})
+            offenders.add(fp)
+    for (fp, _args), count in identical.items():
+        if count >= 2:
+            violations.append({"kind": "duplicate_statement", "fingerprint": fp, "count": count})
+            offenders.add(fp)
+
+    return violations, offenders
+
+
+def _explain(conn, query, args):
+    """EXPLAIN on the connection that ran the statement (never executes it)."""
+    if not query.lstrip().upper().startswith("SELECT"):
+        return None
+
+    # a replica read is explained on that replica, where it actually ran
+    cur = conn.cursor(DictCursor)
+    try:
+        cur.execute("EXPLAIN " + query, args)
+        return [dict(row) for row in cur.fetchall()]
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        cur.close()
+
+
+def _check_request(response):
+    entries = g.pop("_db_log", None)
+    if not entries:
+        return response
+
+    violations, offenders = analyze(entries)
+    if not violations:
+        return response
+
+    queries = {}
+    for fp, query, args, ms, rows, conn in entries:
+        q = queries.setdefault(fp, {"fingerprint": fp, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0})
+        q["count"] += 1
+        q["total_ms"] = round(q["total_ms"] + ms, 3)
+        q["max_ms"] = round(max(q["max_ms"], ms), 3)
+        q["rows"] += max(rows or 0, 0)
+        if _settings["explain"] and fp in offenders and "explain" not in q:
+            q["explain"] = _explain(conn, query, args)
+
+    report = {
+        "ts": datetime.now().isoformat(timespec="milliseconds"),
+        "endpoint": request.endpoint,
+        "method": request.method,
+        "path": request.path,
+        "status": response.status_code,
+        "query_count": len(entries),
+        "db_ms": round(sum(e[3] for e in entries), 3),
+        "violations": violations,
+        "queries": sorted(queries.values(), key=lambda q: -q["total_ms"]),
+    }
+    try:
+        line = json.dumps(report, default=str)
+        with _write_lock, open(_settings["report_path"], "a") as f:
+            f.write(line + "\n")
+    except OSError:
+        log.exception("could not write db diagnostics report")
+    return response
@@ -0,0 +1,93 @@
+"""
+Conditional GET for list pages.
+
+Ticket writes bump version counters kept in the cache backend:
+  - tickets:responders     any ticket change (every responder queue may move)
+  - tickets:user:<id>      a change to one of that employee's tickets
+A list page's ETag is a hash of the versions it depends on plus everything
+else the rendered HTML depends on (viewer, navbar unread count, query
+string). A matching If-None-Match is answered with 304 before any list
+query runs or the template renders.
+
+The counters must be visible to every worker process, so this is only on
+by default with a shared CACHE_URL; LIST_ETAGS=1 forces it on for
+single-process deployments, LIST_ETAGS=0 turns it off.
+"""
+import hashlib
+import time
+
+from flask import request, session, make_response
+
+from .cache import CounterCache
+
+RESPONDERS = "tickets:responders"
+
+
+def owner_key(user_id):
+    return f"tickets:user:{user_id}"
+
+
+class ListVersions:
+    def __init__(self):
+        self.cache = CounterCache("version")
+        self.enabled = False
+
+    def init_app(self, app):
+        self.cache.init_app(app)
+        setting = str(app.config.get("LIST_ETAGS", "auto")).lower()
+        self.enabled = bool(app.config.get("CACHE_URL")) if setting == "auto" else setting == "1"
+
+    def get(self, key):
+        value = self.cache.get(key)
+        if value is None:
+            # seeded from the clock so an evicted counter never repeats an old version
+            value = time.time_ns()
+            self.cache.set(key, value)
+        return value
+
+    def bump(self, *keys):
+        for key in keys:
+            if self.cache.incr(key, 1) is None:
+                self.cache.set(key, time.time_ns())
+
+    def ticket_changed(self, owner_id):
+        """Call after committing any write to a ticket owned by owner_id."""
+        if self.enabled:
+            self.bump(RESPONDERS, owner_key(owner_id))
+
+    def page_etag(self, *keys):
+        """ETag for the current request's list page, or None when disabled."""
+        if not self.enabled:
+            return None
+        from ..messages.unread import get_unread_count
+
+        parts = [
+            request.endpoint,
+            session.get("user_id"),
+            session.get("role"),
+            get_unread_count(session["user_id"]) if "user_id" in session else 0,
+            request.query_string.decode(),
+            time.strftime("%Y"),  # footer year
+            *(f"{k}={self.get(k)}" for k in keys),
+        ]
+        return hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:24]
+
+
+def not_modified(etag):
+    """A 304 response when the client already has `etag`, else None."""
+    if etag and request.if_none_match.contains_weak(etag):
+        resp = make_response("", 304)
+        return _tag(resp, etag)
+    return None
+
+
+def with_etag(body, etag):
+    resp = make_response(body)
+    return _tag(resp, etag) if etag else resp
+
+
+def _tag(resp, etag):
+    resp.set_etag(etag, weak=True)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
@@ -0,0 +1,131 @@
+"""
+Fragment cache for rendered ticket rows.
+
+`{{ ticket_rows("partials/home_ticket_row.html", tickets) }}` renders the
+partial once per (template, ticket id, updated_at, version, viewer role,
+archived) and serves the cached HTML afterwards. A changed ticket gets a
+new updated_at and therefore a new key. DATETIME has one-second
+resolution, though, so the write routes also call `invalidate(ticket_id)`,
+which bumps the ticket's version in the shared CACHE_URL backend; every
+worker reads the versions of a page in one round trip.
+
+Entries live in each worker process, in a size-bounded LRU
+(FRAGMENT_CACHE_SIZE rows). Without a shared backend a write is only seen
+by the worker that handled it, so FRAGMENT_CACHE=auto (default) caches only
+when CACHE_URL is set; 1 forces the per-process cache (single-process
+deployments), 0 turns it off.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, session
+from markupsafe import Markup
+
+from .cache import CounterCache
+
+
+class FragmentCache:
+    def __init__(self):
+        self.maxsize = 5000
+        self.enabled = False
+        self.versions = CounterCache("fragment_version")  # ticket id -> version, shared
+        self.shared = False
+        self._data = OrderedDict()  # key -> Markup
+        self._by_ticket = {}         # ticket id -> set of keys
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        self.maxsize = app.config.get("FRAGMENT_CACHE_SIZE", 5000)
+        self.shared = bool(app.config.get("CACHE_URL"))
+        setting = str(app.config.get("FRAGMENT_CACHE", "auto")).lower()
+        self.enabled = self.shared if setting == "auto" else setting == "1"
+        self.versions.init_app(app)
+        app.add_template_global(self.ticket_row, "ticket_row")
+        app.add_template_global(self.ticket_rows, "ticket_rows")
+
+    # ---------------- Versions ----------------
+    def _versions(self, ticket_ids):
+        if not self.shared:
+            return [None] * len(ticket_ids)
+        values = self.versions.get_many(ticket_ids)
+        for i, value in enumerate(values):
+            if value is None:
+                # seeded from the clock so an evicted version never repeats an old one
+                values[i] = time.time_ns()
+                self.versions.set(ticket_ids[i], values[i])
+        return values
+
+    # ---------------- Rendering ----------------
+    def ticket_rows(self, template_name, tickets):
+        """All rows of a list page; versions are fetched in one round trip."""
+        tickets = list(tickets)
+        role = session.get("role")
+        if not self.enabled:
+            return Markup("\n").join(self._render(template_name, t, role) for t in tickets)
+        versions = self._versions([t["id"] for t in tickets])
+        return Markup("\n").join(self._row(template_name, t, v, role) for t, v in zip(tickets, versions))
+
+    def ticket_row(self, template_name, ticket):
+        return self.ticket_rows(template_name, [ticket])
+
+    def _row(self, template_name, ticket, version, role):
+        key = (template_name, ticket["id"], ticket.get("updated_at"), version, role, bool(ticket.get("archived")))
+        with self._lock:
+            html = self._data.get(key)
+            if html is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        # render outside the lock; a concurrent miss on the same key just renders twice
+        html = self._render(template_name, ticket, role)
+        with self._lock:
+            self._data[key] = html
+            self._by_ticket.setdefault(ticket["id"], set()).add(key)
+            while len(self._data) > self.maxsize:
+                old, _ = self._data.popitem(last=False)
+                self._forget(old)
+                self.evictions += 1
+        return html
+
+    @staticmethod
+    def _render(template_name, ticket, role):
+        template = current_app.jinja_env.get_template(template_name)
+        return Markup(template.render(ticket=ticket, role=role))
+
+    # ---------------- Invalidation ----------------
+    def _forget(self, key):
+        keys = self._by_ticket.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_ticket[key[1]]
+
+    def invalidate(self, ticket_id):
+        """Drop every cached row of one ticket (call after a ticket write)."""
+        if self.shared:
+            # other workers' entries are keyed on the old version
+            if self.versions.incr(ticket_id, 1) is None:
+                self.versions.set(ticket_id, time.time_ns())
+        with self._lock:
+            for key in self._by_ticket.pop(ticket_id, ()):
+                self._data.pop(key, None)
+                self.invalidations += 1
+
+    # ---------------- Stats ----------------
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
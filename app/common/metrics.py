@@ -0,0 +1,168 @@
+"""
+Minimal Prometheus-compatible metrics registry (no external dependency).
+
+Values live in this worker process only; with several gunicorn workers
+each one exposes its own series and Prometheus aggregates them by
+instance, same as prometheus_client without multiprocess mode.
+"""
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _num(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, doc, labelnames=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def header(self):
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_num(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels, value):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][idx] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_num(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, doc, labelnames=()):
+        return self._add(Counter(name, doc, labelnames))
+
+    def gauge(self, name, doc, labelnames=()):
+        return self._add(Gauge(name, doc, labelnames))
+
+    def histogram(self, name, doc, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, doc, labelnames, buckets))
+
+    def collector(self, fn):
+        """fn() -> iterable of (name, doc, kind, {labels-tuple: value}) sampled at scrape time."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for fn in self._collectors:
+            for name, doc, kind, samples in fn():
+                lines.append(f"# HELP {name} {doc}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples.items():
+                    lines.append(f"{name}{_labels([k for k, _ in labels], [v for _, v in labels])} {_num(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ---------------- Shared series ----------------
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Request latency by endpoint.", ("endpoint", "method", "status")
+)
+REQUEST_QUERIES = registry.histogram(
+    "http_request_db_queries", "SQL statements executed per request.", ("endpoint",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+REQUEST_DB_SECONDS = registry.histogram(
+    "http_request_db_seconds", "Time spent in SQL per request.", ("endpoint",)
+)
+TEMPLATE_RENDER = registry.histogram(
+    "template_render_seconds", "Jinja render time by template.", ("template",)
+)
+QUERY_LATENCY = registry.histogram(
+    "db_query_duration_seconds", "Latency per SQL fingerprint.", ("query",)
+)
+QUERY_ROWS = registry.counter(
+    "db_query_rows_total", "Rows returned / affected per SQL fingerprint.", ("query",)
+)
+POOL_WAIT = registry.histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection."
+)
+COMPRESS_BYTES_IN = registry.counter(
+    "http_compress_bytes_in_total", "Response bytes before compression.", ("endpoint", "encoding")
+)
+COMPRESS_BYTES_OUT = registry.counter(
+    "http_compress_bytes_out_total", "Response bytes after compression.", ("endpoint", "encoding")
+)
+COMPRESS_RATIO = registry.histogram(
+    "http_compress_ratio", "Compressed / original size per response.", ("endpoint", "encoding"),
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0),
+)
@@ -0,0 +1,44 @@
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Returns (created_at, id) or None for a missing / malformed token."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_clause(cursor, created_col: str, id_col: str):
+    """
+    SQL fragment (starting with AND) selecting rows strictly after `cursor`
+    in `ORDER BY created_col DESC, id_col DESC` order.
+    """
+    if cursor is None:
+        return "", ()
+    created_at, row_id = cursor
+    sql = f"AND ({created_col} < %s OR ({created_col} = %s AND {id_col} < %s))"
+    return sql, (created_at, created_at, row_id)
+
+
+def split_page(rows, page_size: int, created_key="created_at", id_key="id"):
+    """
+    Queries fetch page_size + 1 rows; the extra row only tells us whether a
+    next page exists. Returns (rows, next_cursor_token_or_None).
+    """
+    rows = list(rows)
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(last[created_key], last[id_key])
@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from collections import deque
+
+import MySQLdb
+from flask import g
+
+from .metrics import POOL_WAIT
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within DB_POOL_TIMEOUT."""
+
+
+class ConnectionPool:
+    """
+    Bounded, fork-safe pool of MySQLdb connections.
+
+    - DB_POOL_SIZE connections are kept open and reused across requests.
+    - Up to DB_POOL_MAX_OVERFLOW extra connections are opened under burst
+      load and closed again when they are returned.
+    - Idle connections older than DB_POOL_IDLE_TIMEOUT seconds are replaced,
+      and connections are pinged on checkout when DB_POOL_PRE_PING is on.
+    - After a fork (gunicorn workers) the child drops the parent's sockets
+      and starts with an empty pool.
+
+    One connection is checked out per app context (request / CLI command)
+    and returned on teardown, so `cur.connection.commit()` keeps working
+    exactly like it did with flask_mysqldb.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Condition()
+        self._idle = deque()  # (conn, last_used)
+        self._in_use = 0
+        self._pid = os.getpid()
+        self._settings = {}
+        self._connect_kwargs = {}
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._opened = 0
+        self._closed = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    # ---------------- Setup ----------------
+    def configure(self, cfg, host=None, port=None):
+        """Read connection + pool settings; host/port override MYSQL_HOST/PORT (replicas)."""
+        self._connect_kwargs = dict(
+            host=host or cfg.get("MYSQL_HOST") or "localhost",
+            user=cfg.get("MYSQL_USER") or "",
+            passwd=cfg.get("MYSQL_PASSWORD") or "",
+            db=cfg.get("MYSQL_DB") or "",
+            port=port or cfg.get("MYSQL_PORT", 3306),
+            charset=cfg.get("MYSQL_CHARSET", "utf8"),
+            connect_timeout=cfg.get("DB_CONNECT_TIMEOUT", 10),
+        )
+        self._settings = dict(
+            size=cfg.get("DB_POOL_SIZE", 5),
+            max_overflow=cfg.get("DB_POOL_MAX_OVERFLOW", 10),
+            timeout=cfg.get("DB_POOL_TIMEOUT", 30.0),
+            idle_timeout=cfg.get("DB_POOL_IDLE_TIMEOUT", 300.0),
+            pre_ping=cfg.get("DB_POOL_PRE_PING", True),
+        )
+
+    def init_app(self, app):
+        self.configure(app.config)
+        app.extensions["db_pool"] = self
+        app.teardown_appcontext(self._teardown)
+
+    def _teardown(self, exc):
+        conn = g.pop("_db_conn", None)
+        if conn is not None:
+            self.release(conn)
+
+    # ---------------- Fork safety ----------------
+    def _check_pid(self):
+        # Called with the lock held. Sockets inherited from the parent must
+        # not be used (or closed) by the child, so just forget about them.
+        if self._pid != os.getpid():
+            self._idle.clear()
+            self._in_use = 0
+            self._pid = os.getpid()
+
+    def reset(self):
+        """Drop every pooled connection; used by gunicorn's post_fork hook."""
+        with self._lock:
+            self._idle.clear()
+            self._in_use = 0
+            self._pid = os.getpid()
+            self._lock.notify_all()
+
+    # ---------------- Checkout / checkin ----------------
+    @property
+    def in_use(self):
+        return self._in_use
+
+    @property
+    def capacity(self):
+        return self._settings["size"] + self._settings["max_overflow"]
+
+    def _open(self):
+        conn = MySQLdb.connect(**self._connect_kwargs)
+        self._opened += 1
+        return conn
+
+    @property
+    def connect_kwargs(self):
+        """Connection settings, for code that needs its own unpooled connection."""
+        return dict(self._connect_kwargs)
+
+    def _discard(self, conn):
+        self._closed += 1
+        try:
+            conn.close()
+        except MySQLdb.Error:
+            pass
+
+    def _healthy(self, conn, last_used):
+        if time.monotonic() - last_used > self._settings["idle_timeout"]:
+            return False
+        if not self._settings["pre_ping"]:
+            return True
+        try:
+            conn.ping()
+            return True
+        except MySQLdb.Error:
+            return False
+
+    def acquire(self):
+        started = time.monotonic()
+        deadline = started + self._settings["timeout"]
+
+        with self._lock:
+            self._check_pid()
+            while not self._idle and self._in_use >= self.capacity:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"no database connection available after {self._settings['timeout']}s"
+                    )
+                self._lock.wait(remaining)
+                self._check_pid()
+
+            self._in_use += 1
+            item = self._idle.pop() if self._idle else None
+
+            waited = time.monotonic() - started
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        POOL_WAIT.observe(value=waited)
+
+        # network I/O happens outside the lock
+        try:
+            if item is not None:
+                conn, last_used = item
+                if self._healthy(conn, last_used):
+                    return conn
+                self._discard(conn)
+            return self._open()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+    def release(self, conn):
+        # never hand an open transaction to the next borrower
+        try:
+            conn.rollback()
+            reusable = True
+        except MySQLdb.Error:
+            reusable = False
+
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._in_use -= 1
+            keep = reusable and len(self._idle) < self._settings["size"]
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+        if not keep:
+            self._discard(conn)
+
+    def connection(self):
+        """The connection bound to the current app context (lazily checked out)."""
+        conn = g.get("_db_conn")
+        if conn is None:
+            conn = self.acquire()
+            g._db_conn = conn
+        return conn
+
+    # ---------------- Stats ----------------
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self._settings.get("size"),
+                "max_overflow": self._settings.get("max_overflow"),
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "opened": self._opened,
+                "closed": self._closed,
+                "wait_seconds_total": round(self._wait_total, 6),
+                "wait_seconds_max": round(self._wait_max, 6),
+            }
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A bounded mailbox for one SSE client; slow clients lose old events."""
+
+    def __init__(self, bus, channels, maxsize=100):
+        self.bus = bus
+        self.channels = tuple(channels)
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def deliver(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            try:
+                self._queue.get_nowait()
+                self._queue.put_nowait(message)
+            except (queue.Empty, queue.Full):
+                pass
+
+    def get(self, timeout):
+        """Next message dict, or None after `timeout` seconds of silence."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncSubscription(Subscription):
+    """Mailbox for an asyncio consumer (asgi.py); deliver() may run on any thread."""
+
+    def __init__(self, bus, channels, loop, maxsize=100):
+        self.bus = bus
+        self.channels = tuple(channels)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message):
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _put(self, message):
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    async def next(self, timeout):
+        """Next message dict, or None after `timeout` seconds of silence."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBus:
+    """In-process fan-out; only reaches clients connected to this worker."""
+
+    def __init__(self):
+        self._subs = {}  # channel -> set(Subscription)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        return self._register(Subscription(self, channels))
+
+    def subscribe_async(self, channels, loop):
+        return self._register(AsyncSubscription(self, channels, loop))
+
+    def _register(self, sub):
+        with self._lock:
+            for ch in sub.channels:
+                self._subs.setdefault(ch, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, sub):
+        with self._lock:
+            for ch in sub.channels:
+                subs = self._subs.get(ch)
+                if subs:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subs[ch]
+
+    def publish(self, channel, message):
+        self._dispatch(channel, message)
+
+    def _dispatch(self, channel, message):
+        with self._lock:
+            targets = list(self._subs.get(channel, ()))
+        for sub in targets:
+            sub.deliver(message)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len({s for subs in self._subs.values() for s in subs})
+
+
+class RedisBus(LocalBus):
+    """
+    Cross-worker bus: publishes go through Redis PUBLISH and one listener
+    thread per worker process fans them out to local subscribers.
+    """
+
+    def __init__(self, url):
+        super().__init__()
+        import redis  # optional dependency, only needed when PUBSUB_URL is set
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = "tms:bus:"
+        self._listener_pid = None
+
+    def _register(self, sub):
+        self._ensure_listener()
+        return super()._register(sub)
+
+    def publish(self, channel, message):
+        self._client.publish(self._prefix + channel, json.dumps(message, default=str))
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+        threading.Thread(target=self._listen, name="pubsub-listener", daemon=True).start()
+
+    def _listen(self):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(self._prefix + "*")
+        for item in pubsub.listen():
+            try:
+                channel = item["channel"].decode()[len(self._prefix):]
+                self._dispatch(channel, json.loads(item["data"]))
+            except (ValueError, KeyError, AttributeError):
+                log.warning("ignoring malformed bus message: %r", item)
+
+
+class EventBus:
+    """
+    Publish/subscribe facade used by the routes and the /stream endpoint.
+    Backend is picked from PUBSUB_URL (redis://...), else in-process.
+    """
+
+    def __init__(self):
+        self.backend = LocalBus()
+        self.published = 0
+
+    def init_app(self, app):
+        url = app.config.get("PUBSUB_URL")
+        self.backend = RedisBus(url) if url else LocalBus()
+
+    def publish(self, channel, event_type, **data):
+        self.published += 1
+        try:
+            self.backend.publish(channel, {"type": event_type, "data": data})
+        except Exception:
+            # live updates are best effort; never fail the write that triggered them
+            log.exception("failed to publish %s on %s", event_type, channel)
+
+    def subscribe(self, channels):
+        return self.backend.subscribe(channels)
+
+    def subscribe_async(self, channels, loop):
+        return self.backend.subscribe_async(channels, loop)
+
+    def stats(self):
+        return {"published": self.published, "subscribers": self.backend.subscriber_count()}
@@ -0,0 +1,201 @@
+"""
+Read-replica routing for `get_cursor(readonly=True)`.
+
+- DB_REPLICAS lists replica hosts ("host[:port],..."); each gets its own
+  ConnectionPool with the primary's credentials and pool settings.
+- DB_REPLICA_STRATEGY picks one per request: "round_robin" or
+  "least_connections" (fewest checked-out connections).
+- Every DB_REPLICA_LAG_CHECK_INTERVAL seconds a replica's lag is read from
+  SHOW REPLICA STATUS; replicas behind by more than DB_REPLICA_MAX_LAG
+  seconds (or with replication stopped) are skipped until the next check.
+- Read-your-writes: a request that wrote to the primary marks the session
+  sticky for DB_READ_YOUR_WRITES_SECONDS, and that user's readonly
+  cursors use the primary until it expires (e.g. home after create_ticket).
+
+With no replicas configured, or none healthy, readonly cursors simply use
+the primary connection of the request.
+"""
+import itertools
+import logging
+import threading
+import time
+
+import MySQLdb
+from MySQLdb.cursors import DictCursor
+from flask import g, session, has_request_context
+
+from .pool import ConnectionPool
+
+log = logging.getLogger(__name__)
+
+_STICKY_KEY = "_db_sticky_until"
+
+
+class Replica:
+    def __init__(self, name, pool):
+        self.name = name
+        self.pool = pool
+        self.lag = None
+        self.healthy = True
+        self.checked_at = 0.0
+        self.checking = False
+
+
+class ReplicaSet:
+    def __init__(self, primary):
+        self._primary = primary
+        self._replicas = []
+        self._lock = threading.Lock()
+        self._rr = itertools.count()
+        self._settings = {}
+
+        self._reads = 0
+        self._primary_reads = 0
+        self._sticky_reads = 0
+
+    # ---------------- Setup ----------------
+    def init_app(self, app):
+        cfg = app.config
+        self._settings = dict(
+            strategy=cfg.get("DB_REPLICA_STRATEGY", "round_robin"),
+            max_lag=cfg.get("DB_REPLICA_MAX_LAG", 5.0),
+            check_interval=cfg.get("DB_REPLICA_LAG_CHECK_INTERVAL", 5.0),
+            sticky_seconds=cfg.get("DB_READ_YOUR_WRITES_SECONDS", 5.0),
+        )
+        self._replicas = []
+        for spec in filter(None, (h.strip() for h in (cfg.get("DB_REPLICAS") or "").split(","))):
+            host, _, port = spec.partition(":")
+            pool = ConnectionPool()
+            pool.configure(cfg, host=host, port=int(port) if port else None)
+            self._replicas.append(Replica(spec, pool))
+
+        app.extensions["db_replicas"] = self
+        app.after_request(self._mark_sticky)
+        app.teardown_appcontext(self._teardown)
+
+    def _teardown(self, exc):
+        item = g.pop("_db_ro", None)
+        if item is not None:
+            pool, conn = item
+            pool.release(conn)
+
+    def reset(self):
+        for r in self._replicas:
+            r.pool.reset()
+
+    # ---------------- Read-your-writes ----------------
+    def _mark_sticky(self, response):
+        if g.get("_db_wrote") and self._replicas:
+            session[_STICKY_KEY] = time.time() + self._settings["sticky_seconds"]
+        return response
+
+    def _sticky(self):
+        if not has_request_context():
+            return False
+        until = session.get(_STICKY_KEY)
+        if until is None:
+            return False
+        if until > time.time():
+            return True
+        session.pop(_STICKY_KEY, None)
+        return False
+
+    # ---------------- Lag checks ----------------
+    def _check_lag(self, replica, conn):
+        cur = conn.cursor(DictCursor)
+        try:
+            try:
+                cur.execute("SHOW REPLICA STATUS")
+                row = cur.fetchone() or {}
+                lag = row.get("Seconds_Behind_Source")
+            except MySQLdb.ProgrammingError:
+                # MySQL < 8.0.22 / MariaDB
+                cur.execute("SHOW SLAVE STATUS")
+                row = cur.fetchone() or {}
+                lag = row.get("Seconds_Behind_Master")
+        finally:
+            cur.close()
+
+        # NULL lag means the SQL / IO thread is not running: treat as unusable
+        replica.lag = lag
+        replica.healthy = lag is not None and lag <= self._settings["max_lag"]
+        if not replica.healthy:
+            log.warning("replica %s skipped (lag=%s)", replica.name, lag)
+
+    def _due(self, replica):
+        """True for exactly one caller once the replica's lag check is due."""
+        with self._lock:
+            if replica.checking or time.monotonic() - replica.checked_at < self._settings["check_interval"]:
+                return False
+            replica.checking = True
+            return True
+
+    # ---------------- Selection ----------------
+    def _candidates(self):
+        healthy = [r for r in self._replicas if r.healthy]
+        if not healthy:
+            # everyone failed the last check: let due ones be re-checked
+            healthy = [r for r in self._replicas if time.monotonic() - r.checked_at >= self._settings["check_interval"]]
+        if self._settings["strategy"] == "least_connections":
+            return sorted(healthy, key=lambda r: r.pool.in_use)
+        start = next(self._rr)
+        return [healthy[(start + i) % len(healthy)] for i in range(len(healthy))] if healthy else []
+
+    def _acquire(self):
+        for replica in self._candidates():
+            try:
+                conn = replica.pool.acquire()
+            except Exception:
+                log.exception("replica %s unavailable", replica.name)
+                replica.healthy = False
+                replica.checked_at = time.monotonic()
+                continue
+
+            if self._due(replica):
+                try:
+                    self._check_lag(replica, conn)
+                except MySQLdb.Error:
+                    log.exception("lag check failed on replica %s", replica.name)
+                    replica.healthy = False
+                finally:
+                    replica.checked_at = time.monotonic()
+                    replica.checking = False
+
+            if replica.healthy:
+                return replica.pool, conn
+            replica.pool.release(conn)
+        return None
+
+    def connection(self):
+        """Connection for read-only work in the current app context."""
+        item = g.get("_db_ro")
+        if item is not None:
+            return item[1]
+
+        with self._lock:
+            self._reads += 1
+        if self._replicas and self._sticky():
+            with self._lock:
+                self._sticky_reads += 1
+            return self._primary.connection()
+
+        item = self._acquire() if self._replicas else None
+        if item is None:
+            with self._lock:
+                self._primary_reads += 1
+            return self._primary.connection()
+
+        g._db_ro = item
+        return item[1]
+
+    # ---------------- Stats ----------------
+    def stats(self):
+        with self._lock:
+            return {
+                "replicas": len(self._replicas),
+                "healthy": sum(1 for r in self._replicas if r.healthy),
+                "max_lag_seconds": max((r.lag for r in self._replicas if r.lag is not None), default=None),
+                "reads": self._reads,
+                "primary_reads": self._primary_reads,
+                "sticky_reads": self._sticky_reads,
+            }
@@ -9,11 +9,122 @@ class BaseConfig:
     MYSQL_DB = os.getenv("DB_NAME")
     MYSQL_PORT = int(os.getenv("DB_PORT", "3306"))
 
+    # connection pool (app/common/pool.py)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+    # read replicas for get_cursor(readonly=True) (app/common/replicas.py): "host[:port],..."
+    DB_REPLICAS = os.getenv("DB_REPLICAS")
+    DB_REPLICA_STRATEGY = os.getenv("DB_REPLICA_STRATEGY", "round_robin")  # or least_connections
+    DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+    DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "5"))
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+    # shared cache backend (e.g. redis://localhost:6379/0); in-process LRU when unset
+    CACHE_URL = os.getenv("CACHE_URL")
+    UNREAD_CACHE_SIZE = int(os.getenv("UNREAD_CACHE_SIZE", "10000"))
+    UNREAD_CACHE_TTL = int(os.getenv("UNREAD_CACHE_TTL", "60"))
+    # profiles: auto = only with CACHE_URL (a per-worker LRU would serve stale profiles
+    # after an edit handled by another worker), 1 = always, 0 = never
+    PROFILE_CACHE = os.getenv("PROFILE_CACHE", "auto")
+    PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+    PROFILE_CACHE_TTL = int(os.getenv("PROFILE_CACHE_TTL", "300"))
+
+    # ETags on ticket list pages (app/common/etag.py): auto = on when CACHE_URL is set
+    LIST_ETAGS = os.getenv("LIST_ETAGS", "auto")
+    VERSION_CACHE_SIZE = int(os.getenv("VERSION_CACHE_SIZE", "100000"))
+    VERSION_CACHE_TTL = int(os.getenv("VERSION_CACHE_TTL", "86400"))
+
+    # rows per page on keyset-paginated lists
+    HOME_PAGE_SIZE = int(os.getenv("HOME_PAGE_SIZE", "50"))
+    DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "50"))
+    USERS_PAGE_SIZE = int(os.getenv("USERS_PAGE_SIZE", "50"))
+    MESSAGES_PAGE_SIZE = int(os.getenv("MESSAGES_PAGE_SIZE", "50"))
+    MESSAGE_PREVIEW_CHARS = int(os.getenv("MESSAGE_PREVIEW_CHARS", "120"))
+    SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "20"))
+    SEARCH_MAX_PAGES = int(os.getenv("SEARCH_MAX_PAGES", "50"))
+
+    # ticket_events background writer (app/tickets/events.py)
+    EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "10000"))
+    EVENTS_BATCH_SIZE = int(os.getenv("EVENTS_BATCH_SIZE", "200"))
+    EVENTS_FLUSH_INTERVAL = float(os.getenv("EVENTS_FLUSH_INTERVAL", "1.0"))
+
+    # live updates over Server-Sent Events (app/stream); in-process bus when unset.
+    # LIVE_UPDATES=auto serves /stream only under asgi.py (an open stream would
+    # hold a sync gunicorn thread); 1 forces it on (e.g. gevent workers), 0 off
+    LIVE_UPDATES = os.getenv("LIVE_UPDATES", "auto")
+    PUBSUB_URL = os.getenv("PUBSUB_URL")
+    SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_MAX_SECONDS = int(os.getenv("SSE_MAX_SECONDS", "300"))
+
+    # Prometheus /metrics (app/monitoring); scrapes need METRICS_TOKEN as a bearer
+    # token, without a token the endpoint is 404 unless METRICS_PUBLIC=1
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "0") == "1"
+
+    # slow-query / N+1 detector (app/common/diagnostics.py), off by default
+    DB_DIAGNOSTICS = os.getenv("DB_DIAGNOSTICS", "0") == "1"
+    DB_DIAG_MAX_QUERIES = int(os.getenv("DB_DIAG_MAX_QUERIES", "20"))
+    DB_DIAG_MAX_DB_MS = float(os.getenv("DB_DIAG_MAX_DB_MS", "250"))
+    DB_DIAG_SLOW_QUERY_MS = float(os.getenv("DB_DIAG_SLOW_QUERY_MS", "100"))
+    DB_DIAG_REPEAT_THRESHOLD = int(os.getenv("DB_DIAG_REPEAT_THRESHOLD", "3"))
+    DB_DIAG_REPORT_PATH = os.getenv("DB_DIAG_REPORT_PATH", "db_diagnostics.jsonl")
+    DB_DIAG_EXPLAIN = os.getenv("DB_DIAG_EXPLAIN", "1") == "1"
+
+    # archiving of done tickets (flask archive-tickets, app/tickets/archive.py)
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    ARCHIVE_BATCH_PAUSE = float(os.getenv("ARCHIVE_BATCH_PAUSE", "0.5"))
+
+    # bulk user provisioning (POST /api/users/provision is disabled without a token);
+    # the endpoint takes at most PROVISION_MAX_ROWS rows so it fits in the gunicorn
+    # timeout, bigger imports go through `flask provision-users`
+    PROVISION_TOKEN = os.getenv("PROVISION_TOKEN")
+    PROVISION_MAX_ROWS = int(os.getenv("PROVISION_MAX_ROWS", "1000"))
+    PROVISION_WORKERS = int(os.getenv("PROVISION_WORKERS", "4"))
+    PROVISION_CHUNK_SIZE = int(os.getenv("PROVISION_CHUNK_SIZE", "500"))
+
+    # rendered ticket rows (app/common/fragments.py), per worker process: auto = only
+    # with CACHE_URL (it holds the per-ticket versions that tell other workers about
+    # a write), 1 = always, 0 = never
+    FRAGMENT_CACHE = os.getenv("FRAGMENT_CACHE", "auto")
+    FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", "5000"))
+    FRAGMENT_VERSION_CACHE_TTL = int(os.getenv("FRAGMENT_VERSION_CACHE_TTL", "86400"))
+
+    # fingerprinted + precompressed static files (app/common/assets.py, flask build-static);
+    # the build dir defaults to instance/static
+    STATIC_FINGERPRINT = os.getenv("STATIC_FINGERPRINT", "1") == "1"
+    STATIC_BUILD_DIR = os.getenv("STATIC_BUILD_DIR")
+    STATIC_COMPRESS_LEVEL = int(os.getenv("STATIC_COMPRESS_LEVEL", "9"))
+
+    # response compression (app/common/compression.py); brotli only when installed
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+    COMPRESS_BR_QUALITY = int(os.getenv("COMPRESS_BR_QUALITY", "4"))
+    COMPRESS_MIMETYPES = os.getenv(
+        "COMPRESS_MIMETYPES",
+        "text/html,text/plain,text/css,text/javascript,application/javascript,application/json",
+    )
+
+    # ASGI mode (asgi.py, app/asgi.py): bridge threads for the regular views,
+    # native async handlers, aiomysql pool
+    ASGI_THREADS = int(os.getenv("ASGI_THREADS", "16"))
+    ASGI_NATIVE_ROUTES = os.getenv("ASGI_NATIVE_ROUTES", "1") == "1"
+    ASYNC_DB_POOL_MIN = int(os.getenv("ASYNC_DB_POOL_MIN", "1"))
+    ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = "Lax"
 
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
+    # edited CSS / JS should show up without a restart
+    STATIC_FINGERPRINT = os.getenv("STATIC_FINGERPRINT", "0") == "1"
 
 class ProductionConfig(BaseConfig):
     DEBUG = False
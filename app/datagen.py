@@ -0,0 +1,310 @@
+"""
+Synthetic data for capacity planning (`flask generate-data`).
+
+Rows get explicit ids allocated above the current MAX(id), and every row
+is derived from its offset in the run (id - base), the --seed and --now,
+so:
+  - shards can be generated and loaded by parallel worker processes,
+  - later phases (declines, events) can recompute a ticket's status
+    without reading it back,
+  - two runs with the same seed, --now and volumes produce the same data,
+    whatever is already in the database; only ids and usernames are
+    shifted by the id bases.
+
+Phases run in FK order (users -> tickets -> declines / events / messages)
+and finish by rebuilding responder_queue for the new tickets.
+"""
+import math
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import MySQLdb
+from werkzeug.security import generate_password_hash
+
+from .tickets import queue
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+               "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson"]
+CITIES = [("Springfield", "IL", "62701"), ("Austin", "TX", "73301"), ("Denver", "CO", "80202"),
+          ("Seattle", "WA", "98101"), ("Boston", "MA", "02108"), ("Miami", "FL", "33101")]
+ORGANIZATIONS = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+TOPICS = ["printer", "vpn", "laptop", "email", "password", "monitor", "network", "badge", "software"]
+PROBLEMS = ["not working", "keeps crashing", "is very slow", "needs replacement", "access request",
+            "shows an error", "cannot connect", "setup request"]
+
+USER_COLUMNS = ("id", "username", "email", "password", "role", "firstname", "lastname", "dob",
+                "address_line1", "city", "state", "zip_code", "phone_e164", "profession",
+                "organization", "created_at")
+TICKET_COLUMNS = ("id", "user_id", "responder_id", "title", "description", "status",
+                  "created_at", "updated_at", "completed_at")
+DECLINE_COLUMNS = ("ticket_id", "responder_id", "status", "created_at")
+EVENT_COLUMNS = ("ticket_id", "actor_user_id", "event_type", "from_status", "to_status", "created_at")
+MESSAGE_COLUMNS = ("message_type", "sender_id", "receiver_id", "subject", "body", "is_read", "created_at")
+
+
+# ---------------- Deterministic row builders ----------------
+def _rng(plan, kind, n):
+    # n is an offset within this run, never an absolute id
+    return random.Random(plan["seed"] * 1_000_003 + kind * 7_919_000_003 + n)
+
+
+def _is_responder(plan, uid):
+    return uid - plan["user_base"] <= plan["responders"]
+
+
+def _random_employee(plan, rnd):
+    return plan["user_base"] + plan["responders"] + rnd.randint(1, plan["employees"])
+
+
+def _random_responder(plan, rnd):
+    return plan["user_base"] + rnd.randint(1, plan["responders"])
+
+
+def user_row(plan, uid):
+    rnd = _rng(plan, 1, uid - plan["user_base"])
+    role = "responder" if _is_responder(plan, uid) else "employee"
+    first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+    city, state, zip_code = rnd.choice(CITIES)
+    return (
+        # ids are unique across runs, so repeated runs never collide on username
+        uid, f"{plan['prefix']}_{role}_{uid}", f"{plan['prefix']}_{role}_{uid}@example.com",
+        plan["password_hash"], role, first, last,
+        (datetime(1960, 1, 1) + timedelta(days=rnd.randint(0, 15000))).date(),
+        f"{rnd.randint(1, 9999)} Main St", city, state, zip_code,
+        f"+1217555{rnd.randint(0, 9999):04d}",
+        "Support Engineer" if role == "responder" else "Analyst",
+        rnd.choice(ORGANIZATIONS),
+        plan["now"] - timedelta(days=plan["days"] + rnd.randint(0, 365)),
+    )
+
+
+def ticket(plan, tid):
+    """All generated attributes of one ticket, recomputable from its id."""
+    rnd = _rng(plan, 2, tid - plan["ticket_base"])
+    # volume grows over time: ages are skewed towards recent days
+    age = timedelta(seconds=plan["days"] * 86400 * rnd.random() ** 2)
+    created = plan["now"] - age
+
+    # older tickets are mostly done, fresh ones mostly pending
+    if age < timedelta(days=2):
+        weights = (60, 35, 5)
+    elif age < timedelta(days=14):
+        weights = (25, 35, 40)
+    else:
+        weights = (3, 7, 90)
+    status = rnd.choices(("pending", "in process", "done"), weights=weights)[0]
+
+    responder = None if status == "pending" else _random_responder(plan, rnd)
+    assigned = created + timedelta(minutes=rnd.expovariate(1 / 90)) if responder else None
+    completed = None
+    if status == "done":
+        completed = min(assigned + timedelta(hours=rnd.expovariate(1 / 24)), plan["now"])
+        assigned = min(assigned, completed)
+
+    declined_by = set()
+    if status != "done" and rnd.random() < plan["declined_rate"]:
+        for _ in range(rnd.randint(1, 3)):
+            r = _random_responder(plan, rnd)
+            if r != responder:
+                declined_by.add(r)
+
+    topic, problem = rnd.choice(TOPICS), rnd.choice(PROBLEMS)
+    return {
+        "id": tid,
+        "user_id": _random_employee(plan, rnd),
+        "responder_id": responder,
+        "title": f"{topic.capitalize()} {problem}",
+        "description": f"My {topic} {problem}. " + " ".join(rnd.choice(PROBLEMS) for _ in range(rnd.randint(3, 30))),
+        "status": status,
+        "created_at": created.replace(microsecond=0),
+        "assigned_at": assigned.replace(microsecond=0) if assigned else None,
+        "completed_at": completed.replace(microsecond=0) if completed else None,
+        "declined_by": sorted(declined_by),
+    }
+
+
+def ticket_rows(plan, start, end):
+    for tid in range(start, end):
+        t = ticket(plan, tid)
+        yield (t["id"], t["user_id"], t["responder_id"], t["title"], t["description"], t["status"],
+               t["created_at"], t["completed_at"] or t["assigned_at"] or t["created_at"], t["completed_at"])
+
+
+def decline_rows(plan, start, end):
+    for tid in range(start, end):
+        t = ticket(plan, tid)
+        for r in t["declined_by"]:
+            yield (tid, r, "declined", t["created_at"])
+
+
+def event_rows(plan, start, end):
+    for tid in range(start, end):
+        t = ticket(plan, tid)
+        yield (tid, t["user_id"], "created", None, "pending", t["created_at"])
+        if t["responder_id"]:
+            yield (tid, t["responder_id"], "assigned", "pending", "in_process", t["assigned_at"])
+        for r in t["declined_by"]:
+            yield (tid, r, "declined", "pending", "pending", t["created_at"])
+        if t["status"] == "done":
+            yield (tid, t["responder_id"], "status_changed", "in_process", "done", t["completed_at"])
+
+
+def message_rows(plan, start, end):
+    for n in range(start, end):
+        rnd = _rng(plan, 3, n)
+        employee, responder = _random_employee(plan, rnd), _random_responder(plan, rnd)
+        sender, receiver = (employee, responder) if rnd.random() < 0.5 else (responder, employee)
+        sent = plan["now"] - timedelta(seconds=plan["days"] * 86400 * rnd.random() ** 2)
+        yield (
+            "direct", sender, receiver,
+            f"Re: {rnd.choice(TOPICS)}",
+            " ".join(rnd.choice(PROBLEMS) for _ in range(rnd.randint(5, 60))),
+            1 if rnd.random() < 0.7 else 0,
+            sent.replace(microsecond=0),
+        )
+
+
+# ---------------- Loading ----------------
+def _tsv(value):
+    if value is None:
+        return "\\N"
+    s = value.isoformat(" ") if isinstance(value, datetime) else str(value)
+    return s.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _load(conn, table, columns, rows, mode, batch):
+    """Load rows in chunked transactions of `batch` rows; returns the row count."""
+    cur = conn.cursor()
+    total = 0
+    cols = ", ".join(columns)
+
+    def flush(chunk):
+        if mode == "infile":
+            with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False, encoding="utf-8") as f:
+                for row in chunk:
+                    f.write("\t".join(_tsv(v) for v in row) + "\n")
+            try:
+                cur.execute(
+                    f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 ({cols})",
+                    (f.name,),
+                )
+            finally:
+                os.unlink(f.name)
+        else:
+            placeholders = ", ".join(["%s"] * len(columns))
+            # MySQLdb turns this into one multi-row INSERT per call
+            cur.executemany(f"INSERT INTO {table} ({cols}) VALUES ({placeholders})", chunk)
+        conn.commit()
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch:
+            flush(chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+        total += len(chunk)
+    cur.close()
+    return total
+
+
+_PHASES = {
+    "users": ("users", USER_COLUMNS, lambda plan, s, e: (user_row(plan, uid) for uid in range(s, e))),
+    "tickets": ("tickets", TICKET_COLUMNS, ticket_rows),
+    "declines": ("ticket_responder_log", DECLINE_COLUMNS, decline_rows),
+    "events": ("ticket_events", EVENT_COLUMNS, event_rows),
+    "messages": ("messages", MESSAGE_COLUMNS, message_rows),
+}
+
+
+def _run_shard(job):
+    """Worker entry point: generate and load one id range of one phase."""
+    phase, start, end, plan = job
+    table, columns, rows = _PHASES[phase]
+    conn = MySQLdb.connect(**plan["connect_kwargs"], local_infile=plan["mode"] == "infile")
+    try:
+        cur = conn.cursor()
+        # ids are consistent by construction; skip per-row FK lookups during the load
+        cur.execute("SET foreign_key_checks = 0")
+        cur.close()
+        return _load(conn, table, columns, rows(plan, start, end), plan["mode"], plan["batch"])
+    finally:
+        conn.close()
+
+
+def _shards(start, count, parts):
+    size = max(1, math.ceil(count / parts))
+    return [(s, min(s + size, start + count)) for s in range(start, start + count, size)]
+
+
+def generate(connect_kwargs, users, tickets, messages, responder_ratio=0.1, declined_rate=0.15,
+             days=365, workers=4, batch=5000, mode="insert", seed=42, prefix="gen",
+             password="password123", now=None, log=print):
+    """
+    Generate and load everything; returns {phase: rows} counts.
+    `declined_rate` is the share of open tickets declined by 1-3 responders.
+    History ends at `now` (default: the current time, logged so a run can
+    be repeated).
+    """
+    if users < 2:
+        raise ValueError("users must be at least 2 (one employee and one responder)")
+    now = (now or datetime.now()).replace(microsecond=0)
+    log(f"{'now':>9}: {now.isoformat(' ')}")
+
+    conn = MySQLdb.connect(**connect_kwargs)
+    cur = conn.cursor()
+    cur.execute("SELECT COALESCE(MAX(id), 0) FROM users")
+    user_base = cur.fetchone()[0]
+    cur.execute("SELECT COALESCE(MAX(id), 0) FROM tickets")
+    ticket_base = cur.fetchone()[0]
+
+    responders = min(max(1, round(users * responder_ratio)), users - 1)
+    plan = {
+        "seed": seed,
+        "prefix": prefix,
+        # hashing millions of passwords is not what we are sizing; all users share one
+        "password_hash": generate_password_hash(password),
+        "now": now,
+        "days": days,
+        "declined_rate": declined_rate,
+        "user_base": user_base,
+        "ticket_base": ticket_base,
+        "responders": responders,
+        "employees": users - responders,
+        "batch": batch,
+        "mode": mode,
+        "connect_kwargs": connect_kwargs,
+    }
+
+    counts = {}
+    ctx = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    with ctx.Pool(workers) as pool:
+        for phase, base, count in (
+            ("users", user_base + 1, users),
+            ("tickets", ticket_base + 1, tickets),
+            ("declines", ticket_base + 1, tickets),
+            ("events", ticket_base + 1, tickets),
+            ("messages", 0, messages),
+        ):
+            started = time.monotonic()
+            jobs = [(phase, s, e, plan) for s, e in _shards(base, count, workers * 4)]
+            counts[phase] = sum(pool.map(_run_shard, jobs)) if count else 0
+            log(f"{phase:>9}: {counts[phase]:>10} rows in {time.monotonic() - started:6.1f}s")
+
+    # responder_queue for the new open tickets, in bounded transactions
+    started = time.monotonic()
+    for s, e in _shards(ticket_base + 1, tickets, max(1, tickets // 10000)):
+        queue.refresh_range(cur, s, e - 1)
+    log(f"{'queue':>9}: rebuilt in {time.monotonic() - started:6.1f}s")
+
+    cur.close()
+    conn.close()
+    return counts
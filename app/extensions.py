@@ -1,3 +1,20 @@
-from flask_mysqldb import MySQL
+from .common.aiodb import AsyncPool
+from .common.assets import StaticAssets
+from .common.cache import CounterCache, ObjectCache
+from .common.compression import Compressor
+from .common.etag import ListVersions
+from .common.fragments import FragmentCache
+from .common.pool import ConnectionPool
+from .common.replicas import ReplicaSet
+from .common.pubsub import EventBus
 
-mysql = MySQL()
+db_pool = ConnectionPool()
+db_replicas = ReplicaSet(db_pool)
+aio_pool = AsyncPool()
+unread_counts = CounterCache("unread")
+user_profiles = ObjectCache("profile")
+list_versions = ListVersions()
+ticket_fragments = FragmentCache()
+event_bus = EventBus()
+static_assets = StaticAssets()
+compressor = Compressor()
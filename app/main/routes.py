@@ -1,5 +1,8 @@
-from flask import Blueprint, render_template, redirect, url_for, session
+from flask import Blueprint, render_template, redirect, url_for, session, request, current_app
 from ..common.db import get_cursor
+from ..common.etag import RESPONDERS, owner_key, not_modified, with_etag
+from ..common.pagination import decode_cursor, keyset_clause, split_page
+from ..extensions import list_versions
 
 bp = Blueprint("main", __name__)
 
@@ -16,69 +19,67 @@ def home():
     if "username" not in session:
         return redirect(url_for("auth.login"))
 
-    with get_cursor() as cur:
+    # answer a refresh of an unchanged page before touching the tickets
+    if session.get("role") == "responder":
+        etag = list_versions.page_etag(RESPONDERS)
+    else:
+        etag = list_versions.page_etag(owner_key(session.get("user_id")))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    # keyset pagination on (created_at, id), newest first
+    cursor = decode_cursor(request.args.get("cursor"))
+    page_size = current_app.config["HOME_PAGE_SIZE"]
+
+    with get_cursor(dict_cursor=True, readonly=True) as cur:
         # ---------------- Responder View ----------------
         if session.get("role") == "responder":
+            # responder_queue already excludes done / taken / declined tickets
+            after_sql, after_params = keyset_clause(cursor, "q.created_at", "q.ticket_id")
             cur.execute(
-                """
-                SELECT t.id, t.title, t.description, u.username AS creator_name,
-                       t.status, t.created_at, r.username AS responder_name
-                FROM tickets t
+                f"""
+                SELECT t.id, t.title, t.description, u.username,
+                       t.status, t.created_at, t.updated_at, COALESCE(r.username, 'NILL') AS responder
+                FROM responder_queue q
+                JOIN tickets t ON t.id = q.ticket_id
                 JOIN users u ON t.user_id = u.id
                 LEFT JOIN users r ON t.responder_id = r.id
-                WHERE t.status != 'done'
-                  AND (t.responder_id IS NULL OR t.responder_id = %s)
-                  AND NOT EXISTS (
-                      SELECT 1 FROM ticket_responder_log log
-                      WHERE log.ticket_id = t.id
-                        AND log.responder_id = %s
-                        AND log.status = 'declined'
-                  )
-                ORDER BY t.created_at DESC
+                WHERE q.responder_id = %s
+                  {after_sql}
+                ORDER BY q.created_at DESC, q.ticket_id DESC
+                LIMIT %s
                 """,
-                (session["user_id"], session["user_id"]),
+                (session["user_id"], *after_params, page_size + 1),
             )
-
-            tickets = [
-                dict(
-                    id=row[0],
-                    title=row[1],
-                    description=row[2],
-                    username=row[3],
-                    status=row[4],
-                    created_at=row[5],
-                    responder=row[6] if row[6] else "NILL",
-                )
-                for row in cur.fetchall()
-            ]
+            tickets, next_cursor = split_page(cur.fetchall(), page_size)
 
         # ---------------- Employee View ----------------
         else:
+            after_sql, after_params = keyset_clause(cursor, "t.created_at", "t.id")
             cur.execute(
-                """
-                SELECT t.id, t.title, t.description, creator.username AS creator_name,
-                       t.status, t.created_at,
-                       responder.username AS responder_name
+                f"""
+                SELECT t.id, t.title, t.description, creator.username,
+                       t.status, t.created_at, t.updated_at,
+                       COALESCE(responder.username, 'NILL') AS responder
                 FROM tickets t
                 JOIN users creator ON t.user_id = creator.id
                 LEFT JOIN users responder ON t.responder_id = responder.id
                 WHERE t.user_id = %s
-                ORDER BY t.created_at DESC
+                  {after_sql}
+                ORDER BY t.created_at DESC, t.id DESC
+                LIMIT %s
                 """,
-                (session["user_id"],),
+                (session["user_id"], *after_params, page_size + 1),
             )
+            tickets, next_cursor = split_page(cur.fetchall(), page_size)
 
-            tickets = [
-                dict(
-                    id=row[0],
-                    title=row[1],
-                    description=row[2],
-                    username=row[3],
-                    status=row[4],
-                    created_at=row[5],
-                    responder=row[6] if row[6] else "NILL",
-                )
-                for row in cur.fetchall()
-            ]
-
-    return render_template("home.html", tickets=tickets)
+    return with_etag(
+        render_template(
+            "home.html",
+            tickets=tickets,
+            next_cursor=next_cursor,
+            is_first_page=cursor is None,
+        ),
+        etag,
+    )
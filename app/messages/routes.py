@@ -1,5 +1,7 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session
+from flask import Blueprint, render_template, request, redirect, url_for, session, jsonify, current_app
 from ..common.db import get_cursor
+from ..common.pagination import decode_cursor, keyset_clause, split_page
+from .unread import message_delivered, messages_read
 
 bp = Blueprint("messages", __name__)
 
@@ -8,42 +10,59 @@ def messages():
     if "user_id" not in session:
         return redirect(url_for("auth.login"))
 
-    with get_cursor() as cur:
+    # keyset pagination on idx_messages_receiver_time; bodies are loaded on demand
+    cursor = decode_cursor(request.args.get("cursor"))
+    page_size = current_app.config["MESSAGES_PAGE_SIZE"]
+    preview_len = current_app.config["MESSAGE_PREVIEW_CHARS"]
+    after_sql, after_params = keyset_clause(cursor, "m.created_at", "m.id")
+
+    with get_cursor(dict_cursor=True, readonly=True) as cur:
         cur.execute(
-            """
+            f"""
             SELECT
               m.id,
               m.message_type,
-              COALESCE(u.username, 'System') AS sender_username,
+              COALESCE(u.username, 'System') AS sender,
               m.subject,
-              m.body,
+              LEFT(m.body, %s) AS preview,
+              CHAR_LENGTH(m.body) > %s AS truncated,
               m.is_read,
               m.created_at,
               m.ticket_id
             FROM messages m
             LEFT JOIN users u ON m.sender_id = u.id
             WHERE m.receiver_id = %s
-            ORDER BY m.created_at DESC
+              {after_sql}
+            ORDER BY m.created_at DESC, m.id DESC
+            LIMIT %s
             """,
-            (session["user_id"],),
+            (preview_len, preview_len, session["user_id"], *after_params, page_size + 1),
         )
-        rows = cur.fetchall()
-
-    inbox = [
-        dict(
-            id=r[0],
-            message_type=r[1],
-            sender=r[2],
-            subject=r[3],
-            body=r[4],
-            is_read=r[5],
-            created_at=r[6],
-            ticket_id=r[7],
+        inbox, next_cursor = split_page(cur.fetchall(), page_size)
+
+    return render_template(
+        "messages.html",
+        messages=inbox,
+        next_cursor=next_cursor,
+        is_first_page=cursor is None,
+    )
+
+@bp.get("/api/messages/<int:msg_id>")
+def message_body(msg_id: int):
+    if "user_id" not in session:
+        return jsonify({"error": "unauthorized"}), 401
+
+    with get_cursor(readonly=True) as cur:
+        cur.execute(
+            "SELECT body FROM messages WHERE id = %s AND receiver_id = %s",
+            (msg_id, session["user_id"]),
         )
-        for r in rows
-    ]
+        row = cur.fetchone()
+
+    if not row:
+        return jsonify({"error": "not_found"}), 404
 
-    return render_template("messages.html", messages=inbox)
+    return jsonify({"id": msg_id, "body": row[0]})
 
 @bp.post("/messages/<int:msg_id>/read")
 def mark_message_read(msg_id: int):
@@ -55,12 +74,15 @@ def mark_message_read(msg_id: int):
             """
             UPDATE messages
             SET is_read = 1
-            WHERE id = %s AND receiver_id = %s
+            WHERE id = %s AND receiver_id = %s AND is_read = 0
             """,
             (msg_id, session["user_id"]),
         )
+        changed = cur.rowcount
         cur.connection.commit()
 
+    messages_read(session["user_id"], changed)
+
     return redirect(url_for("messages.messages"))
 
 @bp.post("/messages/read_all")
@@ -77,8 +99,11 @@ def mark_all_messages_read():
             """,
             (session["user_id"],),
         )
+        changed = cur.rowcount
         cur.connection.commit()
 
+    messages_read(session["user_id"], changed)
+
     return redirect(url_for("messages.messages"))
 
 @bp.post("/messages/send")
@@ -114,4 +139,6 @@ def send_message():
         )
         cur.connection.commit()
 
+    message_delivered(receiver_id)
+
     return redirect(url_for("users.users_page"))
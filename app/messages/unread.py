@@ -0,0 +1,31 @@
+from ..common.db import get_cursor
+from ..extensions import unread_counts
+from ..stream import notify
+
+
+def get_unread_count(user_id: int) -> int:
+    """Unread messages for the navbar badge; only hits MySQL on a cache miss."""
+    count = unread_counts.get(user_id)
+    if count is not None:
+        return count
+
+    with get_cursor() as cur:
+        cur.execute(
+            "SELECT COUNT(*) FROM messages WHERE receiver_id=%s AND is_read=0",
+            (user_id,),
+        )
+        count = cur.fetchone()[0]
+
+    unread_counts.set(user_id, count)
+    return count
+
+
+def message_delivered(receiver_id: int):
+    # call after commit: bumps the cached count and pushes the navbar badge
+    notify.message_new(receiver_id, unread_counts.incr(receiver_id, 1))
+
+
+def messages_read(receiver_id: int, n: int):
+    # call after commit with the number of rows flipped to is_read=1
+    if n:
+        unread_counts.incr(receiver_id, -n)
@@ -0,0 +1,40 @@
+import time
+
+from flask import g, request, before_render_template, template_rendered
+
+from ..common.metrics import REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_SECONDS, TEMPLATE_RENDER
+
+
+def init_app(app):
+    """Per-request latency, SQL count / time and template render time."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    @app.before_request
+    def _start_timer():
+        g._req_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop("_req_started", None)
+        if started is None:
+            return response
+        endpoint = request.endpoint or "<unmatched>"
+        REQUEST_LATENCY.observe(
+            endpoint, request.method, str(response.status_code),
+            value=time.perf_counter() - started,
+        )
+        REQUEST_QUERIES.observe(endpoint, value=g.get("_db_queries", 0))
+        REQUEST_DB_SECONDS.observe(endpoint, value=g.get("_db_seconds", 0.0))
+        return response
+
+    def _render_started(sender, template, context, **extra):
+        g.setdefault("_tpl_started", []).append(time.perf_counter())
+
+    def _render_done(sender, template, context, **extra):
+        stack = g.get("_tpl_started")
+        if stack:
+            TEMPLATE_RENDER.observe(template.name or "<string>", value=time.perf_counter() - stack.pop())
+
+    before_render_template.connect(_render_started, app, weak=False)
+    template_rendered.connect(_render_done, app, weak=False)
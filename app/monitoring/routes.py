@@ -0,0 +1,61 @@
+import hmac
+
+from flask import Blueprint, Response, request, current_app, abort
+
+from ..common.metrics import registry
+from ..extensions import db_pool, db_replicas, aio_pool, unread_counts, user_profiles, ticket_fragments, event_bus, static_assets
+from ..tickets.claims import claim_stats
+from ..tickets.events import ticket_events
+
+bp = Blueprint("monitoring", __name__)
+
+
+def _snapshot(prefix, doc, stats, counters=()):
+    """Turn a component's stats() dict into gauge / counter samples."""
+    for key, value in stats.items():
+        if value is None:
+            continue
+        kind = "counter" if key in counters else "gauge"
+        name = f"{prefix}_{key}" + ("_total" if kind == "counter" and not key.endswith("_total") else "")
+        yield name, f"{doc} ({key}).", kind, {(): value}
+
+
+@registry.collector
+def _component_stats():
+    yield from _snapshot(
+        "db_pool", "Connection pool", db_pool.stats(),
+        counters=("checkouts", "timeouts", "opened", "closed", "wait_seconds_total"),
+    )
+    yield from _snapshot(
+        "db_replicas", "Read replicas", db_replicas.stats(),
+        counters=("reads", "primary_reads", "sticky_reads"),
+    )
+    yield from _snapshot("aio_pool", "asyncio MySQL pool (ASGI mode)", aio_pool.stats(), counters=("checkouts",))
+    yield from _snapshot("unread_cache", "Unread counter cache", unread_counts.stats(), counters=("hits", "misses"))
+    yield from _snapshot(
+        "fragment_cache", "Ticket row fragment cache", ticket_fragments.stats(),
+        counters=("hits", "misses", "evictions", "invalidations"),
+    )
+    yield from _snapshot("profile_cache", "User profile cache", user_profiles.stats(), counters=("hits", "misses"))
+    yield from _snapshot(
+        "ticket_events", "ticket_events writer", ticket_events.stats(),
+        counters=("enqueued", "dropped", "written", "failed", "flushes", "flush_seconds_total"),
+    )
+    yield from _snapshot("ticket_claims", "Ticket claims", claim_stats.stats(), counters=("claimed", "conflicts", "empty"))
+    yield from _snapshot("event_bus", "Live update bus", event_bus.stats(), counters=("published",))
+    yield from _snapshot(
+        "static_assets", "Fingerprinted static files", static_assets.stats(),
+        counters=("served_br", "served_gzip", "served_identity"),
+    )
+
+
+@bp.get("/metrics")
+def metrics():
+    token = current_app.config.get("METRICS_TOKEN")
+    if not token:
+        # SQL fingerprints and pool internals are not for the public internet
+        if not current_app.config.get("METRICS_PUBLIC"):
+            abort(404)
+    elif not hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()):
+        abort(401)
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
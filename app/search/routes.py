@@ -0,0 +1,118 @@
+import re
+
+from flask import Blueprint, render_template, request, redirect, url_for, session, jsonify, current_app
+from ..common.db import get_cursor
+
+bp = Blueprint("search", __name__)
+
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by default)
+_TOKEN_RE = re.compile(r"\w{3,}", re.UNICODE)
+
+
+def _boolean_query(q: str):
+    """'printer jam' -> '+printer* +jam*' (all terms required, prefix match)."""
+    tokens = _TOKEN_RE.findall(q or "")[:8]
+    return " ".join(f"+{t}*" for t in tokens)
+
+
+def search_tickets(q: str, page: int):
+    """
+    Ranked full-text search over tickets.title / description using the
+    ft_tickets_title_description FULLTEXT index, limited to what the
+    current user may see:
+      - employees: their own tickets
+      - responders: their work queue plus tickets assigned to them
+    Returns (rows, has_next); has_next is False on the SEARCH_MAX_PAGES page.
+    """
+    ft_query = _boolean_query(q)
+    if not ft_query:
+        return [], False
+
+    page_size = current_app.config["SEARCH_PAGE_SIZE"]
+    user_id = session["user_id"]
+
+    if session.get("role") == "responder":
+        scope_sql = """
+            AND (t.responder_id = %s
+                 OR EXISTS (SELECT 1 FROM responder_queue q
+                            WHERE q.responder_id = %s AND q.ticket_id = t.id))
+        """
+        scope_params = (user_id, user_id)
+    else:
+        scope_sql = "AND t.user_id = %s"
+        scope_params = (user_id,)
+
+    with get_cursor(dict_cursor=True, readonly=True) as cur:
+        cur.execute(
+            f"""
+            SELECT t.id, t.title, t.description, u.username, t.status, t.created_at,
+                   COALESCE(r.username, 'NILL') AS responder,
+                   MATCH (t.title, t.description) AGAINST (%s IN BOOLEAN MODE) AS score
+            FROM tickets t
+            JOIN users u ON t.user_id = u.id
+            LEFT JOIN users r ON t.responder_id = r.id
+            WHERE MATCH (t.title, t.description) AGAINST (%s IN BOOLEAN MODE)
+              {scope_sql}
+            ORDER BY score DESC, t.id DESC
+            LIMIT %s OFFSET %s
+            """,
+            (ft_query, ft_query, *scope_params, page_size + 1, (page - 1) * page_size),
+        )
+        rows = list(cur.fetchall())
+
+    has_next = len(rows) > page_size and page < current_app.config["SEARCH_MAX_PAGES"]
+    return rows[:page_size], has_next
+
+
+def _page_arg():
+    page = request.args.get("page", 1, type=int) or 1
+    return min(max(page, 1), current_app.config["SEARCH_MAX_PAGES"])
+
+
+@bp.get("/search")
+def search_page():
+    if "user_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    q = (request.args.get("q") or "").strip()
+    page = _page_arg()
+    tickets, has_next = search_tickets(q, page)
+
+    return render_template(
+        "search.html",
+        q=q,
+        page=page,
+        tickets=tickets,
+        has_next=has_next,
+    )
+
+
+@bp.get("/api/tickets/search")
+def api_search():
+    if "user_id" not in session:
+        return jsonify({"error": "unauthorized"}), 401
+
+    q = (request.args.get("q") or "").strip()
+    page = _page_arg()
+    tickets, has_next = search_tickets(q, page)
+
+    return jsonify(
+        {
+            "q": q,
+            "page": page,
+            "has_next": has_next,
+            "results": [
+                {
+                    "id": t["id"],
+                    "title": t["title"],
+                    "description": t["description"],
+                    "username": t["username"],
+                    "status": t["status"],
+                    "created_at": t["created_at"].isoformat(),
+                    "responder": t["responder"],
+                    "score": float(t["score"]),
+                }
+                for t in tickets
+            ],
+        }
+    )
@@ -178,17 +178,37 @@
     if (messageForm) messageForm.style.display = '';
   }
 
-  async function loadUser(uid) {
+  // profiles of the rows on screen, fetched in one batch request
+  const prefetched = new Map();
+
+  async function prefetch() {
+    const ids = [...document.querySelectorAll('.view-details-btn')]
+      .map(b => b.getAttribute('data-user-id'))
+      .filter(id => !prefetched.has(id))
+      .slice(0, 100);
+    if (!ids.length) return;
+    const res = await fetch(`/api/users?ids=${ids.join(',')}`);
+    if (!res.ok) return;
+    const data = await res.json();
+    data.users.forEach(u => prefetched.set(String(u.id), u));
+  }
+
+  async function fetchUser(uid) {
+    if (prefetched.has(uid)) return prefetched.get(uid);
+    // conditional GET: the browser revalidates with If-None-Match and gets a 304 when unchanged
     const res = await fetch(`/api/user/${uid}`);
-    if (!res.ok) {
+    return res.ok ? res.json() : null;
+  }
+
+  async function loadUser(uid) {
+    const u = await fetchUser(uid);
+    if (!u) {
       body.innerHTML = `<p class="error">Unable to load user details.</p>`;
       receiverInput.value = '';
       if (messageForm) messageForm.style.display = 'none';
       return;
     }
 
-    const u = await res.json();
-
     // inactive user → show only unavailable message
     if (u.inactive === true) {
       body.innerHTML = `<p class="empty-state"><strong>User currently unavailable</strong></p>`;
@@ -214,12 +234,16 @@
     if (messageForm) messageForm.style.display = '';
   }
 
-  document.querySelectorAll('.view-details-btn').forEach(btn => {
-    btn.addEventListener('click', async () => {
-      const uid = btn.getAttribute('data-user-id');
-      openModal();
-      await loadUser(uid);
-    });
+  prefetch();
+  document.addEventListener('users:rendered', prefetch);
+
+  // delegated: rows are re-rendered by the directory typeahead
+  document.addEventListener('click', async (e) => {
+    const btn = e.target.closest('.view-details-btn');
+    if (!btn) return;
+    const uid = btn.getAttribute('data-user-id');
+    openModal();
+    await loadUser(uid);
   });
 
   closeBtn?.addEventListener('click', closeModal);
@@ -231,6 +255,67 @@
   });
 })();
 
+// users directory typeahead:
+(() => {
+  const form = document.getElementById('userSearchForm');
+  if (!form) return;
+
+  const input = document.getElementById('userSearch');
+  const tbody = document.getElementById('usersTbody');
+  const wrap = document.getElementById('usersTableWrap');
+  const empty = document.getElementById('usersEmpty');
+  const next = document.getElementById('usersNext');
+  const apiUrl = form.dataset.apiUrl;
+  let timer = null;
+  let seq = 0;
+
+  function esc(v) {
+    const d = document.createElement('div');
+    d.textContent = v == null ? '' : String(v);
+    return d.innerHTML;
+  }
+
+  function params(after) {
+    const p = new URLSearchParams(new FormData(form));
+    for (const [k, v] of [...p]) if (!v) p.delete(k);
+    if (after) p.set('after', after);
+    return p;
+  }
+
+  async function run() {
+    const mine = ++seq;
+    const p = params();
+    const res = await fetch(`${apiUrl}?${p}`);
+    if (!res.ok || mine !== seq) return;  // a newer keystroke already fired
+    const data = await res.json();
+
+    tbody.innerHTML = data.users.map(u => `
+      <tr>
+        <td>${esc(u.id)}</td>
+        <td>${esc(u.username)}</td>
+        <td>${esc(u.fullname)}</td>
+        <td>${esc(u.organization)}</td>
+        <td>${u.is_active ? 'Active' : 'Inactive'}</td>
+        <td><button type="button" class="view-details-btn" data-user-id="${esc(u.id)}">View details</button></td>
+      </tr>`).join('');
+    wrap.hidden = data.users.length === 0;
+    empty.hidden = data.users.length !== 0;
+    document.dispatchEvent(new CustomEvent('users:rendered'));
+
+    if (next) {
+      next.hidden = !data.next;
+      next.href = data.next ? `${form.action}?${params(data.next)}` : '#';
+    }
+    history.replaceState(null, '', `${form.action}${p.toString() ? '?' + p : ''}`);
+  }
+
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(run, 200);
+  });
+  form.querySelectorAll('select').forEach(sel => sel.addEventListener('change', run));
+})();
+
 // Dashboard deactivate modal
 (() => {
   const openBtn = document.getElementById('openDeactivateModal');
@@ -264,3 +349,114 @@
   // Auto-open if there was an error
   if (hasErr && hasErr.value === "1") openModal();
 })();
+
+// Messages: load full body on demand
+(() => {
+  const buttons = document.querySelectorAll('.show-body-btn');
+  if (!buttons.length) return;
+
+  buttons.forEach(btn => {
+    btn.addEventListener('click', async () => {
+      const id = btn.getAttribute('data-msg-id');
+      const target = document.getElementById(`msgBody${id}`);
+      btn.disabled = true;
+
+      try {
+        const res = await fetch(`/api/messages/${id}`);
+        if (!res.ok) throw new Error();
+        const m = await res.json();
+        target.textContent = m.body;
+        btn.remove();
+      } catch (_) {
+        btn.disabled = false;
+      }
+    });
+  });
+})();
+
+// Live updates (Server-Sent Events from /stream)
+(() => {
+  const url = document.body.dataset.streamUrl;
+  if (!url || !window.EventSource) return;
+
+  const source = new EventSource(url);
+
+  /* Navbar unread badge */
+  const badge = document.getElementById('unreadBadge');
+
+  source.addEventListener('message.new', (e) => {
+    if (!badge) return;
+    const data = JSON.parse(e.data);
+    const count = data.unread_count ?? ((parseInt(badge.textContent, 10) || 0) + 1);
+    badge.textContent = count;
+    badge.style.display = count > 0 ? '' : 'none';
+  });
+
+  /* Ticket table on /home */
+  const rows = document.getElementById('liveTickets');
+  if (!rows) return;
+
+  const role = rows.dataset.role;
+  const me = parseInt(rows.dataset.userId, 10);
+  const firstPage = rows.dataset.firstPage === '1';
+
+  const statusLabel = (s) => s === 'done' ? 'Completed' : s.charAt(0).toUpperCase() + s.slice(1);
+  const findRow = (id) => rows.querySelector(`tr[data-ticket-id="${id}"]`);
+
+  function cell(text, cls) {
+    const td = document.createElement('td');
+    td.textContent = text;
+    if (cls) td.className = cls;
+    return td;
+  }
+
+  function buildRow(t) {
+    const tr = document.createElement('tr');
+    tr.dataset.ticketId = t.id;
+    tr.append(
+      cell(t.id), cell(t.title), cell(t.description), cell(t.username),
+      cell(statusLabel(t.status), 'col-status'), cell(t.created_at), cell(t.responder, 'col-responder')
+    );
+    if (role === 'responder') {
+      const td = document.createElement('td');
+      const a = document.createElement('a');
+      a.href = `/update_ticket/${t.id}`;
+      const b = document.createElement('button');
+      b.textContent = 'Update';
+      a.append(b);
+      td.append(a);
+      tr.append(td);
+    }
+    return tr;
+  }
+
+  source.addEventListener('ticket.created', (e) => {
+    const t = JSON.parse(e.data);
+    if (role !== 'responder' || !firstPage || findRow(t.id)) return;
+    rows.prepend(buildRow(t));
+  });
+
+  source.addEventListener('ticket.updated', (e) => {
+    const t = JSON.parse(e.data);
+    const tr = findRow(t.id);
+    if (!tr) return;
+
+    // responders lose tickets that are finished, taken by someone else, or declined by them
+    const hidden = role === 'responder' && (
+      t.status === 'done' ||
+      (t.responder_id && t.responder_id !== me) ||
+      t.declined_by === me
+    );
+    if (hidden) {
+      tr.remove();
+      return;
+    }
+    tr.querySelector('.col-status').textContent = statusLabel(t.status);
+    tr.querySelector('.col-responder').textContent = t.responder;
+  });
+
+  source.addEventListener('ticket.removed', (e) => {
+    const t = JSON.parse(e.data);
+    findRow(t.id)?.remove();
+  });
+})();
@@ -0,0 +1,40 @@
+"""
+Live-update events published after a write has been committed.
+Payloads carry just enough for script.js to patch the page in place.
+"""
+from ..extensions import event_bus
+
+
+def ticket_created(ticket_id, title, description, username, created_at):
+    # a new ticket is visible to every responder
+    event_bus.publish(
+        "responders",
+        "ticket.created",
+        id=ticket_id,
+        title=title,
+        description=description,
+        username=username,
+        status="pending",
+        created_at=created_at.replace(microsecond=0),
+        responder="NILL",
+    )
+
+
+def ticket_updated(ticket_id, owner_id, status, responder_id, responder, declined_by=None):
+    data = dict(
+        id=ticket_id,
+        status=status,
+        responder_id=responder_id,
+        responder=responder or "NILL",
+        declined_by=declined_by,
+    )
+    event_bus.publish("responders", "ticket.updated", **data)
+    event_bus.publish(f"user:{owner_id}", "ticket.updated", **data)
+
+
+def ticket_removed(ticket_id):
+    event_bus.publish("responders", "ticket.removed", id=ticket_id)
+
+
+def message_new(receiver_id, unread_count=None):
+    event_bus.publish(f"user:{receiver_id}", "message.new", unread_count=unread_count)
@@ -0,0 +1,69 @@
+import json
+import time
+
+from flask import Blueprint, Response, session, current_app, stream_with_context, abort
+from ..extensions import event_bus
+
+bp = Blueprint("stream", __name__)
+
+
+def channels_for(user_id: int, role: str):
+    channels = [f"user:{user_id}"]
+    if role == "responder":
+        channels.append("responders")
+    return channels
+
+
+def live_updates_enabled(app):
+    setting = str(app.config.get("LIVE_UPDATES", "auto")).lower()
+    if setting == "auto":
+        asgi = app.extensions.get("asgi")
+        return asgi is not None and "stream.stream" in asgi.native
+    return setting == "1"
+
+
+@bp.app_context_processor
+def inject_live_updates():
+    # pages that consume live updates put data-stream-url on <body> when this is set
+    return {"live_updates": "user_id" in session and live_updates_enabled(current_app)}
+
+
+def format_event(message):
+    return f"event: {message['type']}\ndata: {json.dumps(message['data'], default=str)}\n\n"
+
+
+@bp.get("/stream")
+def stream():
+    """
+    Server-Sent Events feed for the logged-in user:
+      - ticket.created / ticket.updated / ticket.removed (responders, ticket owners)
+      - message.new (receiver)
+    Under asgi.py this URL is served by app/asgi.py without a thread. This
+    view only answers with LIVE_UPDATES=1: every open stream holds a worker
+    thread for up to SSE_MAX_SECONDS, which sync gunicorn workers cannot afford.
+    """
+    if not live_updates_enabled(current_app):
+        abort(404)
+    if "user_id" not in session:
+        return Response(status=401)
+
+    channels = channels_for(session["user_id"], session.get("role"))
+    heartbeat = current_app.config["SSE_HEARTBEAT_SECONDS"]
+    max_seconds = current_app.config["SSE_MAX_SECONDS"]
+
+    def generate():
+        deadline = time.monotonic() + max_seconds
+        with event_bus.subscribe(channels) as sub:
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                message = sub.get(timeout=heartbeat)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(message)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
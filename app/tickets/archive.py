@@ -0,0 +1,108 @@
+"""
+Hot/cold split for finished work.
+
+`done` tickets older than ARCHIVE_AFTER_DAYS are moved, together with their
+ticket_responder_log and ticket_events rows, into the *_archive tables
+(range-partitioned by completed_at, see ticket_system_schema.sql change 7).
+`flask archive-tickets` moves them in small batches, one short transaction
+per batch with a pause in between, so the live tables never see a long
+lock or a replication burst. Old tickets are found on the (status,
+completed_at) index (change 10, which also stops messages.ticket_id from
+being nulled when a ticket leaves `tickets`).
+
+Read paths only touch the archive when the user asks for it
+(?include_archived=1); `archived_requested()` is the shared switch.
+"""
+import time
+from datetime import datetime, timedelta
+
+from flask import request
+
+from ..extensions import list_versions
+
+# columns copied verbatim; the archive rows also carry the ticket's completed_at
+# (the partitioning key), so all three tables drop old partitions in lockstep
+_TICKET_COLS = "id, user_id, responder_id, title, description, status, created_at, updated_at, completed_at"
+_LOG_COLS = "ticket_id, responder_id, status, created_at"
+_EVENT_COLS = "id, ticket_id, actor_user_id, event_type, from_status, to_status, note, created_at"
+
+
+def archived_requested():
+    return request.args.get("include_archived") == "1"
+
+
+def archive_batch(cur, cutoff, batch_size):
+    """Move one batch of done tickets completed before `cutoff`. Returns tickets moved."""
+    cur.execute(
+        """
+        SELECT id, user_id
+        FROM tickets
+        WHERE status = 'done' AND completed_at < %s
+        ORDER BY completed_at, id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+        """,
+        (cutoff, batch_size),
+    )
+    rows = cur.fetchall()
+    if not rows:
+        return 0
+
+    ids = [r[0] for r in rows]
+    marks = ", ".join(["%s"] * len(ids))
+
+    cur.execute(
+        f"""
+        INSERT INTO tickets_archive ({_TICKET_COLS})
+        SELECT {_TICKET_COLS}
+        FROM tickets WHERE id IN ({marks})
+        """,
+        ids,
+    )
+    cur.execute(
+        f"""
+        INSERT INTO ticket_responder_log_archive ({_LOG_COLS}, completed_at)
+        SELECT log.ticket_id, log.responder_id, log.status, log.created_at, t.completed_at
+        FROM ticket_responder_log log
+        JOIN tickets t ON t.id = log.ticket_id
+        WHERE log.ticket_id IN ({marks})
+        """,
+        ids,
+    )
+    cur.execute(
+        f"""
+        INSERT INTO ticket_events_archive ({_EVENT_COLS}, completed_at)
+        SELECT e.id, e.ticket_id, e.actor_user_id, e.event_type, e.from_status, e.to_status, e.note,
+               e.created_at, t.completed_at
+        FROM ticket_events e
+        JOIN tickets t ON t.id = e.ticket_id
+        WHERE e.ticket_id IN ({marks})
+        """,
+        ids,
+    )
+
+    cur.execute(f"DELETE FROM ticket_events WHERE ticket_id IN ({marks})", ids)
+    cur.execute(f"DELETE FROM ticket_responder_log WHERE ticket_id IN ({marks})", ids)
+    cur.execute(f"DELETE FROM tickets WHERE id IN ({marks})", ids)
+    cur.connection.commit()
+
+    # the tickets left the owners' list pages
+    for owner_id in {r[1] for r in rows}:
+        list_versions.ticket_changed(owner_id)
+    return len(ids)
+
+
+def archive_done(cur, older_than_days, batch_size=500, pause=0.5, max_batches=None, log=print):
+    """Run batches until nothing is left (or max_batches); returns total tickets moved."""
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        started = time.monotonic()
+        moved = archive_batch(cur, cutoff, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        log(f"batch {batches}: {moved} tickets in {time.monotonic() - started:.2f}s (total {total})")
+        time.sleep(pause)
+    return total
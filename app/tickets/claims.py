@@ -0,0 +1,84 @@
+"""
+Contention-safe claiming of pending tickets.
+
+Both paths only ever move a ticket from (pending, unassigned) to
+(in process, me); they never overwrite another responder's claim.
+"""
+import threading
+
+
+class ClaimStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.claimed = 0
+        self.conflicts = 0  # ticket was taken (or declined) before we got it
+        self.empty = 0      # claim-next found nothing claimable
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        return {"claimed": self.claimed, "conflicts": self.conflicts, "empty": self.empty}
+
+
+claim_stats = ClaimStats()
+
+
+def claim_next(cur, responder_id: int):
+    """
+    Claim the oldest pending ticket in the responder's queue. Rows another
+    transaction is claiming right now are skipped instead of waited on,
+    so concurrent responders each get a different ticket.
+    Returns the ticket id, or None when nothing is claimable.
+    """
+    cur.execute(
+        """
+        SELECT t.id
+        FROM responder_queue q
+        JOIN tickets t ON t.id = q.ticket_id
+        WHERE q.responder_id = %s
+          AND t.status = 'pending'
+          AND t.responder_id IS NULL
+        ORDER BY q.created_at ASC, q.ticket_id ASC
+        LIMIT 1
+        FOR UPDATE OF t SKIP LOCKED
+        """,
+        (responder_id,),
+    )
+    row = cur.fetchone()
+    if not row:
+        claim_stats.incr("empty")
+        return None
+
+    cur.execute(
+        "UPDATE tickets SET status = 'in process', responder_id = %s WHERE id = %s",
+        (responder_id, row[0]),
+    )
+    claim_stats.incr("claimed")
+    return row[0]
+
+
+def claim_ticket(cur, ticket_id: int, responder_id: int) -> bool:
+    """Claim one specific ticket only if it is still pending, unassigned and not declined by us."""
+    cur.execute(
+        """
+        UPDATE tickets t
+        SET t.status = 'in process', t.responder_id = %s
+        WHERE t.id = %s
+          AND t.status = 'pending'
+          AND t.responder_id IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM ticket_responder_log log
+              WHERE log.ticket_id = t.id
+                AND log.responder_id = %s
+                AND log.status = 'declined'
+          )
+        """,
+        (responder_id, ticket_id, responder_id),
+    )
+    if cur.rowcount == 1:
+        claim_stats.incr("claimed")
+        return True
+    claim_stats.incr("conflicts")
+    return False
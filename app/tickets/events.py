@@ -0,0 +1,176 @@
+"""
+Asynchronous writer for the `ticket_events` audit trail.
+
+Routes call `ticket_events.record(...)`, which only appends to an in-memory
+queue. A background thread (started lazily in each worker process) drains
+the queue and writes batches with one multi-row INSERT per flush, so the
+request never waits on the audit write.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import MySQLdb
+
+from ..extensions import db_pool
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+# tickets.status uses 'in process', ticket_events uses 'in_process'
+_EVENT_STATUS = {"pending": "pending", "in process": "in_process", "done": "done"}
+
+_INSERT = """
+    INSERT INTO ticket_events
+      (ticket_id, actor_user_id, event_type, from_status, to_status, note, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+class EventWriter:
+    def __init__(self):
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._settings = dict(queue_size=10000, batch_size=200, flush_interval=1.0)
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+
+    def init_app(self, app):
+        self._settings = dict(
+            queue_size=app.config.get("EVENTS_QUEUE_SIZE", 10000),
+            batch_size=app.config.get("EVENTS_BATCH_SIZE", 200),
+            flush_interval=app.config.get("EVENTS_FLUSH_INTERVAL", 1.0),
+        )
+        atexit.register(self.shutdown)
+
+    # ---------------- Producer side ----------------
+    def record(self, ticket_id, actor_user_id, event_type, from_status=None, to_status=None, note=None):
+        """Queue one event; never blocks. Drops (and counts) when the queue is full."""
+        self._ensure_started()
+        event = (
+            ticket_id,
+            actor_user_id,
+            event_type,
+            _EVENT_STATUS.get(from_status),
+            _EVENT_STATUS.get(to_status),
+            note[:255] if note else None,
+            datetime.now(),
+        )
+        try:
+            self._queue.put_nowait(event)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+            log.warning("ticket_events queue full, dropping %s event for ticket %s", event_type, ticket_id)
+
+    def _ensure_started(self):
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._start_lock:
+            # a forked worker inherits neither the thread nor a usable queue
+            if self._pid != os.getpid() or self._thread is None:
+                self._queue = queue.Queue(maxsize=self._settings["queue_size"])
+                self._thread = threading.Thread(target=self._run, name="ticket-events", daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+
+    # ---------------- Consumer side ----------------
+    def _run(self):
+        batch_size = self._settings["batch_size"]
+        interval = self._settings["flush_interval"]
+
+        while True:
+            try:
+                first = self._queue.get(timeout=interval)
+            except queue.Empty:
+                continue
+
+            stop = first is _STOP
+            batch = [] if stop else [first]
+            while len(batch) < batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if batch:
+                self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch):
+        started = time.monotonic()
+        conn = None
+        try:
+            conn = db_pool.acquire()
+            cur = conn.cursor()
+            try:
+                # MySQLdb rewrites this into a single multi-row INSERT
+                cur.executemany(_INSERT, batch)
+                conn.commit()
+                self.written += len(batch)
+            except MySQLdb.IntegrityError:
+                # e.g. an actor removed meanwhile: keep the good rows
+                conn.rollback()
+                for event in batch:
+                    try:
+                        cur.execute(_INSERT, event)
+                        conn.commit()
+                        self.written += 1
+                    except MySQLdb.IntegrityError:
+                        conn.rollback()
+                        self.failed += 1
+            finally:
+                cur.close()
+        except Exception:
+            self.failed += len(batch)
+            log.exception("failed to write %d ticket events", len(batch))
+        finally:
+            if conn is not None:
+                db_pool.release(conn)
+
+        elapsed = time.monotonic() - started
+        self.flushes += 1
+        self.flush_seconds_total += elapsed
+        self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+
+    # ---------------- Lifecycle / stats ----------------
+    def shutdown(self, timeout=10.0):
+        """Flush what is queued and stop the writer (registered with atexit)."""
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "flush_seconds_total": round(self.flush_seconds_total, 6),
+            "flush_seconds_max": round(self.flush_seconds_max, 6),
+        }
+
+
+ticket_events = EventWriter()
@@ -0,0 +1,114 @@
+"""
+Maintains `responder_queue`: one row per (responder, ticket) the responder
+may currently see on /home, i.e. the ticket is not done, is unassigned or
+assigned to them, and they have not declined it.
+
+Every write that can change visibility calls into here inside the same
+transaction, so the home page becomes a single range read on
+idx_rq_responder_created instead of a NOT EXISTS scan.
+
+The price is write amplification proportional to the number of
+responders, so each event only touches the rows it has to:
+  - new ticket          inserts one row per responder (ticket_created)
+  - decline             deletes one row (declined); a decline that hands an
+                        in-process ticket back re-adds the other responders
+  - claim / assignment  deletes the other responders' rows (assigned)
+  - done                deletes the ticket's rows (closed)
+Bulk rebuilds (refresh_range) commit in chunks of at most max_rows rows.
+"""
+
+# eligible (responder, ticket) pairs; callers append a WHERE on t.id or r.id
+_ELIGIBLE = """
+    INSERT INTO responder_queue (responder_id, ticket_id, created_at)
+    SELECT r.id, t.id, t.created_at
+    FROM tickets t
+    JOIN users r
+      ON r.role = 'responder'
+     AND (t.responder_id IS NULL OR t.responder_id = r.id)
+    WHERE t.status IN ('pending', 'in process')
+      AND NOT EXISTS (
+          SELECT 1 FROM ticket_responder_log log
+          WHERE log.ticket_id = t.id
+            AND log.responder_id = r.id
+            AND log.status = 'declined'
+      )
+"""
+
+
+def refresh_ticket(cur, ticket_id: int):
+    """Recompute queue rows for one ticket from scratch (O(responders))."""
+    cur.execute("DELETE FROM responder_queue WHERE ticket_id = %s", (ticket_id,))
+    cur.execute(_ELIGIBLE + " AND t.id = %s", (ticket_id,))
+
+
+def ticket_created(cur, ticket_id: int):
+    """Queue a new ticket for every responder who may see it."""
+    cur.execute(_ELIGIBLE + " AND t.id = %s", (ticket_id,))
+
+
+def declined(cur, ticket_id: int, responder_id: int, released: bool):
+    """One responder declined; `released` = they handed an in-process ticket back."""
+    if released:
+        # it was only in the decliner's queue, now everyone else gets it back
+        refresh_ticket(cur, ticket_id)
+    else:
+        cur.execute(
+            "DELETE FROM responder_queue WHERE ticket_id = %s AND responder_id = %s",
+            (ticket_id, responder_id),
+        )
+
+
+def assigned(cur, ticket_id: int, responder_id: int):
+    """The ticket now belongs to responder_id: drop it from everyone else's queue."""
+    cur.execute(
+        "DELETE FROM responder_queue WHERE ticket_id = %s AND responder_id <> %s",
+        (ticket_id, responder_id),
+    )
+
+
+def closed(cur, ticket_id: int):
+    """The ticket is done and leaves every queue."""
+    cur.execute("DELETE FROM responder_queue WHERE ticket_id = %s", (ticket_id,))
+
+
+def add_responder(cur, responder_id: int):
+    """Backfill the queue of a newly registered responder."""
+    cur.execute(_ELIGIBLE + " AND r.id = %s", (responder_id,))
+
+
+def add_responders(cur, responder_ids):
+    """Backfill the queues of many new responders at once (bulk provisioning)."""
+    if responder_ids:
+        marks = ", ".join(["%s"] * len(responder_ids))
+        cur.execute(_ELIGIBLE + f" AND r.id IN ({marks})", tuple(responder_ids))
+
+
+def refresh_range(cur, first_ticket_id: int, last_ticket_id: int, max_rows: int = 100000):
+    """
+    Rebuild queue rows for a block of tickets loaded in bulk (flask generate-data).
+    Works through the responders in chunks so that no transaction writes more
+    than about max_rows rows; commits after every chunk.
+    """
+    cur.execute(
+        "DELETE FROM responder_queue WHERE ticket_id BETWEEN %s AND %s",
+        (first_ticket_id, last_ticket_id),
+    )
+    cur.connection.commit()
+
+    chunk = max(1, max_rows // max(1, last_ticket_id - first_ticket_id + 1))
+    after = 0
+    while True:
+        cur.execute(
+            "SELECT id FROM users WHERE role = 'responder' AND id > %s ORDER BY id LIMIT %s",
+            (after, chunk),
+        )
+        ids = [r[0] for r in cur.fetchall()]
+        if not ids:
+            break
+        marks = ", ".join(["%s"] * len(ids))
+        cur.execute(
+            _ELIGIBLE + f" AND t.id BETWEEN %s AND %s AND r.id IN ({marks})",
+            (first_ticket_id, last_ticket_id, *ids),
+        )
+        cur.connection.commit()
+        after = ids[-1]
@@ -1,6 +1,14 @@
 from datetime import datetime
 from flask import Blueprint, render_template, request, redirect, url_for, session
 from ..common.db import get_cursor
+from ..messages.unread import message_delivered
+from . import queue
+from .archive import archived_requested
+from .claims import claim_stats, claim_next, claim_ticket as try_claim_ticket
+from .events import ticket_events
+from ..stream import notify
+from ..common.etag import owner_key, not_modified, with_etag
+from ..extensions import list_versions, ticket_fragments
 
 bp = Blueprint("tickets", __name__)
 
@@ -24,8 +32,14 @@ def create_ticket():
                 """,
                 (user_id, title, description, now),
             )
+            ticket_id = cur.lastrowid
+            queue.ticket_created(cur, ticket_id)
             cur.connection.commit()
 
+        ticket_events.record(ticket_id, user_id, "created", to_status="pending")
+        notify.ticket_created(ticket_id, title, description, session["username"], now)
+        list_versions.ticket_changed(user_id)
+
         return redirect(url_for("main.home"))
 
     return render_template("create_ticket.html")
@@ -41,6 +55,16 @@ def update_ticket(ticket_id: int):
         if request.method == "POST":
             new_status = request.form["status"]
 
+            # previous state, for the audit trail
+            cur.execute(
+                "SELECT status, responder_id, user_id FROM tickets WHERE id = %s FOR UPDATE",
+                (ticket_id,),
+            )
+            prev = cur.fetchone()
+            if not prev:
+                return "Ticket not found", 404
+            prev_status, prev_responder, owner_id = prev
+
             if new_status == "declined":
                 # 1) Log declined response per responder (idempotent)
                 cur.execute(
@@ -65,7 +89,27 @@ def update_ticket(ticket_id: int):
                     """,
                     (ticket_id, session["user_id"]),
                 )
+                released = cur.rowcount > 0
+                queue.declined(cur, ticket_id, session["user_id"], released)
+                event = ("declined", prev_status, "pending" if released else prev_status)
+                responder = None
+                if prev_responder is not None and not released:
+                    # still someone else's: keep their name in the live row
+                    cur.execute("SELECT username FROM users WHERE id = %s", (prev_responder,))
+                    row = cur.fetchone()
+                    responder = row[0] if row else None
+                live = dict(
+                    status="pending" if released else prev_status,
+                    responder_id=None if released else prev_responder,
+                    responder=responder,
+                    declined_by=session["user_id"],
+                )
             else:
+                # the row is locked, so this check cannot race another claim
+                if prev_responder not in (None, session["user_id"]):
+                    claim_stats.incr("conflicts")
+                    return "Ticket already claimed by another responder", 409
+
                 # Update ticket with responder and possibly set completion time
                 completed_at = datetime.now() if new_status == "done" else None
                 cur.execute(
@@ -75,11 +119,31 @@ def update_ticket(ticket_id: int):
                         responder_id = %s,
                         completed_at = %s
                     WHERE id = %s
+                      AND (responder_id IS NULL OR responder_id = %s)
                     """,
-                    (new_status, session["user_id"], completed_at, ticket_id),
+                    (new_status, session["user_id"], completed_at, ticket_id, session["user_id"]),
+                )
+                claimed = prev_responder != session["user_id"]
+                if new_status == "done":
+                    queue.closed(cur, ticket_id)
+                elif prev_status == "done":
+                    queue.refresh_ticket(cur, ticket_id)  # reopened
+                elif claimed:
+                    queue.assigned(cur, ticket_id, session["user_id"])
+                event = ("assigned" if claimed else "status_changed", prev_status, new_status)
+                live = dict(
+                    status=new_status,
+                    responder_id=session["user_id"],
+                    responder=session["username"],
                 )
 
             cur.connection.commit()
+
+            event_type, from_status, to_status = event
+            ticket_events.record(ticket_id, session["user_id"], event_type, from_status, to_status)
+            notify.ticket_updated(ticket_id, owner_id, **live)
+            list_versions.ticket_changed(owner_id)
+            ticket_fragments.invalidate(ticket_id)
             return redirect(url_for("main.home"))
 
         # GET request – fetch ticket data
@@ -98,21 +162,76 @@ def update_ticket(ticket_id: int):
     return render_template("update_ticket.html", ticket=ticket)
 
 
+# ---------------- Claim Tickets ----------------
+def _finish_claim(cur, ticket_id: int):
+    """Commit a successful claim, then audit and broadcast it."""
+    cur.execute("SELECT user_id FROM tickets WHERE id = %s", (ticket_id,))
+    owner_id = cur.fetchone()[0]
+    queue.assigned(cur, ticket_id, session["user_id"])
+    cur.connection.commit()
+
+    ticket_events.record(ticket_id, session["user_id"], "assigned", "pending", "in process")
+    notify.ticket_updated(ticket_id, owner_id, "in process", session["user_id"], session["username"])
+    list_versions.ticket_changed(owner_id)
+    ticket_fragments.invalidate(ticket_id)
+
+
+@bp.post("/claim_next")
+def claim_next_ticket():
+    if "username" not in session or session.get("role") != "responder":
+        return redirect(url_for("auth.login"))
+
+    with get_cursor() as cur:
+        ticket_id = claim_next(cur, session["user_id"])
+        if ticket_id is None:
+            return redirect(url_for("main.home"))
+        _finish_claim(cur, ticket_id)
+
+    return redirect(url_for("tickets.update_ticket", ticket_id=ticket_id))
+
+
+@bp.post("/claim_ticket/<int:ticket_id>")
+def claim_ticket(ticket_id: int):
+    if "username" not in session or session.get("role") != "responder":
+        return redirect(url_for("auth.login"))
+
+    with get_cursor() as cur:
+        if not try_claim_ticket(cur, ticket_id, session["user_id"]):
+            return "Ticket already claimed by another responder", 409
+        _finish_claim(cur, ticket_id)
+
+    return redirect(url_for("tickets.update_ticket", ticket_id=ticket_id))
+
+
 # ---------------- Manage Tickets ----------------
 @bp.get("/manage_tickets")
 def manage_tickets():
     if "username" not in session or session.get("role") != "employee":
         return redirect(url_for("auth.login"))
 
+    etag = list_versions.page_etag(owner_key(session["user_id"]))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    include_archived = archived_requested()
+    sql = """
+        SELECT id, title, description, status, created_at, updated_at, 0 AS archived
+        FROM tickets
+        WHERE user_id = %s
+    """
+    if include_archived:
+        sql += """
+        UNION ALL
+        SELECT id, title, description, status, created_at, updated_at, 1 AS archived
+        FROM tickets_archive
+        WHERE user_id = %s
+        """
+
     with get_cursor() as cur:
         cur.execute(
-            """
-            SELECT id, title, description, status, created_at
-            FROM tickets
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            """,
-            (session["user_id"],),
+            sql + " ORDER BY created_at DESC",
+            (session["user_id"], session["user_id"]) if include_archived else (session["user_id"],),
         )
         tickets = [
             dict(
@@ -121,11 +240,16 @@ def manage_tickets():
                 description=row[2],
                 status=("Completed" if row[3] == "done" else row[3].capitalize()),
                 created_at=row[4],
+                updated_at=row[5],
+                archived=bool(row[6]),
             )
             for row in cur.fetchall()
         ]
 
-    return render_template("manage_tickets.html", tickets=tickets)
+    return with_etag(
+        render_template("manage_tickets.html", tickets=tickets, include_archived=include_archived),
+        etag,
+    )
 
 
 # ---------------- Edit Ticket ----------------
@@ -142,7 +266,13 @@ def edit_ticket(ticket_id: int):
                 "UPDATE tickets SET title = %s, description = %s WHERE id = %s AND user_id = %s",
                 (title, description, ticket_id, session["user_id"]),
             )
+            edited = cur.rowcount
             cur.connection.commit()
+
+            if edited:
+                ticket_events.record(ticket_id, session["user_id"], "edited")
+                list_versions.ticket_changed(session["user_id"])
+                ticket_fragments.invalidate(ticket_id)
             return redirect(url_for("tickets.manage_tickets"))
 
         cur.execute(
@@ -181,7 +311,8 @@ def delete_ticket(ticket_id: int):
         responder_id, status, title = row
 
         # alert responder only if it was already being worked on / completed
-        if responder_id and status in ("in process", "done"):
+        alerted = responder_id if responder_id and status in ("in process", "done") else None
+        if alerted:
             employee_name = session.get("username", "Employee")
             subject = "Ticket deleted alert"
             body = f"{employee_name} deleted this ticket #{ticket_id} ({title}) while it was {status} by you."
@@ -200,4 +331,11 @@ def delete_ticket(ticket_id: int):
         )
         cur.connection.commit()
 
+    ticket_events.record(ticket_id, session["user_id"], "deleted", from_status=status, note=title)
+    notify.ticket_removed(ticket_id)
+    list_versions.ticket_changed(session["user_id"])
+    ticket_fragments.invalidate(ticket_id)
+    if alerted:
+        message_delivered(alerted)
+
     return redirect(url_for("tickets.manage_tickets"))
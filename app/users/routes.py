@@ -1,29 +1,214 @@
-from flask import Blueprint, render_template, session, jsonify, redirect, url_for
+import hashlib
+from datetime import datetime
+
+from flask import Blueprint, render_template, session, jsonify, redirect, url_for, request, current_app
 from ..common.db import get_cursor
+from ..extensions import user_profiles
 
 bp = Blueprint("users", __name__)
 
+# ---------------- Directory search ----------------
+def _like_prefix(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def search_users_query(target_role, q="", organization="", active="", after=None, limit=50):
+    """
+    Prefix search over username / firstname / lastname within one role,
+    ordered by username and keyset-paginated on it (usernames are unique).
+    Each matching column is its own range read on a (role, <column>) index;
+    with no query it is a single range read on (role, username).
+    Returns (sql, params) fetching up to limit + 1 dict rows.
+    """
+    filters, params = "", []
+    if organization:
+        filters += " AND organization = %s"
+        params.append(organization)
+    if active in ("0", "1"):
+        filters += " AND is_active = %s"
+        params.append(int(active))
+    if after:
+        filters += " AND username > %s"
+        params.append(after)
+
+    columns = ("username", "firstname", "lastname") if q else ("username",)
+    parts, all_params = [], []
+    for col in columns:
+        prefix_sql = f" AND {col} LIKE %s" if q else ""
+        parts.append(
+            f"""
+            (SELECT id, username, firstname, lastname, organization, is_active
+             FROM users
+             WHERE role = %s{prefix_sql}{filters}
+             ORDER BY username
+             LIMIT %s)
+            """
+        )
+        all_params += [target_role, *([_like_prefix(q)] if q else []), *params, limit + 1]
+
+    # UNION (not ALL): someone can match on more than one column
+    return " UNION ".join(parts) + " ORDER BY username LIMIT %s", (*all_params, limit + 1)
+
+
+def split_users(rows, limit):
+    """(rows, next_after) from the limit + 1 rows of search_users_query()."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, rows[-1]["username"]
+
+
+def search_users(target_role, q="", organization="", active="", after=None, limit=50):
+    """Run search_users_query(); returns (rows, next_after)."""
+    sql, params = search_users_query(target_role, q, organization, active, after, limit)
+    with get_cursor(dict_cursor=True, readonly=True) as cur:
+        cur.execute(sql, params)
+        return split_users(cur.fetchall(), limit)
+
+
+def directory_target(role):
+    return "responder" if role == "employee" else "employee"
+
+
+def directory_args(args):
+    return (
+        (args.get("q") or "").strip()[:100],
+        (args.get("org") or "").strip(),
+        args.get("active", ""),
+        args.get("after") or None,
+    )
+
+
+def search_payload(users, next_after):
+    """JSON body of /api/users/search (shared with the async handler in app/asgi.py)."""
+    return {
+        "users": [
+            {
+                "id": u["id"],
+                "username": u["username"],
+                "fullname": f"{(u['firstname'] or '').strip()} {(u['lastname'] or '').strip()}".strip(),
+                "organization": u["organization"],
+                "is_active": u["is_active"],
+            }
+            for u in users
+        ],
+        "next": next_after,
+    }
+
+
 @bp.get("/users")
 def users_page():
     if "user_id" not in session:
         return redirect(url_for("auth.login"))
 
-    my_role = session.get("role")
-    target_role = "responder" if my_role == "employee" else "employee"
+    target_role = directory_target(session.get("role"))
+    q, org, active, after = directory_args(request.args)
+
+    users, next_after = search_users(
+        target_role, q, org, active, after, current_app.config["USERS_PAGE_SIZE"]
+    )
 
-    with get_cursor() as cur:
+    with get_cursor(readonly=True) as cur:
+        # loose index scan on idx_users_role_org
         cur.execute(
-            """
-            SELECT id, username, is_active
-            FROM users
-            WHERE role = %s
-            ORDER BY username
-            """,
+            "SELECT DISTINCT organization FROM users WHERE role = %s AND organization IS NOT NULL ORDER BY organization",
             (target_role,),
         )
-        users = cur.fetchall()
+        organizations = [r[0] for r in cur.fetchall()]
+
+    return render_template(
+        "users.html",
+        users=users,
+        target_role=target_role,
+        organizations=organizations,
+        q=q,
+        org=org,
+        active=active,
+        next_after=next_after,
+        is_first_page=after is None,
+    )
 
-    return render_template("users.html", users=users, target_role=target_role)
+
+@bp.get("/api/users/search")
+def api_users_search():
+    if "user_id" not in session:
+        return jsonify({"error": "unauthorized"}), 401
+
+    target_role = directory_target(session.get("role"))
+    q, org, active, after = directory_args(request.args)
+    users, next_after = search_users(
+        target_role, q, org, active, after, current_app.config["USERS_PAGE_SIZE"]
+    )
+    return jsonify(search_payload(users, next_after))
+
+
+# ---------------- Profiles ----------------
+# Profiles are cached whole (user_profiles, keyed by id; by default only with
+# a shared CACHE_URL, see ObjectCache) and invalidated by the account routes
+# that change them; role scoping is applied on the way out, so one cached
+# entry serves every viewer. Responses carry an ETag and Last-Modified from
+# users.updated_at and are revalidated by the browser.
+_PROFILE_COLUMNS = """
+    id, username, firstname, lastname, email,
+    address_line1, address_line2, city, state, zip_code,
+    phone_e164, profession, organization, role, is_active, updated_at
+"""
+MAX_BATCH_PROFILES = 100
+
+
+def _profile(r):
+    fullname = f"{(r[2] or '').strip()} {(r[3] or '').strip()}".strip()
+    return {
+        "id": r[0],
+        "username": r[1],
+        "fullname": fullname,
+        "email": r[4],
+        "address_line1": r[5],
+        "address_line2": r[6],
+        "city": r[7],
+        "state": r[8],
+        "zip_code": r[9],
+        "phone": r[10],
+        "profession": r[11],
+        "organization": r[12],
+        "role": r[13],
+        "is_active": r[14],
+        "updated_at": r[15].isoformat(),
+    }
+
+
+def load_profiles(ids):
+    """{id: profile} for the ids that exist; cache first, one IN query for the rest."""
+    ids = list(dict.fromkeys(ids))
+    found = {uid: p for uid, p in zip(ids, user_profiles.get_many(ids)) if p is not None}
+    missing = [uid for uid in ids if uid not in found]
+    if missing:
+        marks = ", ".join(["%s"] * len(missing))
+        # primary, not a replica: a lagging replica would re-cache a stale profile for the whole TTL
+        with get_cursor() as cur:
+            cur.execute(f"SELECT {_PROFILE_COLUMNS} FROM users WHERE id IN ({marks})", missing)
+            for row in cur.fetchall():
+                profile = _profile(row)
+                user_profiles.set(profile["id"], profile)
+                found[profile["id"]] = profile
+    return found
+
+
+def _public(profile):
+    # inactive users only reveal that they are unavailable
+    if profile["is_active"] == 0:
+        return {"id": profile["id"], "inactive": True}
+    return {k: v for k, v in profile.items() if k != "updated_at"}
+
+
+def _conditional(payload, etag, updated_at):
+    resp = jsonify(payload)
+    resp.set_etag(etag)
+    resp.last_modified = updated_at
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True  # always revalidate; unchanged profiles get a 304
+    return resp.make_conditional(request)
 
 
 @bp.get("/api/user/<int:uid>")
@@ -34,44 +219,42 @@ def api_user(uid: int):
     my_role = session.get("role")
     target_role = "responder" if my_role == "employee" else "employee"
 
-    with get_cursor() as cur:
-        cur.execute(
-            """
-            SELECT
-              id, username, firstname, lastname, email,
-              address_line1, address_line2, city, state, zip_code,
-              phone_e164, profession, organization, role, is_active
-            FROM users
-            WHERE id=%s AND role=%s
-            """,
-            (uid, target_role),
-        )
-        r = cur.fetchone()
-
-    if not r:
+    profile = load_profiles([uid]).get(uid)
+    if not profile or profile["role"] != target_role:
         return jsonify({"error": "not_found"}), 404
 
-    # index 14 is is_active
-    if r[14] == 0:
-        return jsonify({"inactive": True}), 200
+    payload = _public(profile)
+    if payload.get("inactive"):
+        payload = {"inactive": True}
+    updated_at = datetime.fromisoformat(profile["updated_at"])
+    return _conditional(payload, f"u{uid}-{int(updated_at.timestamp())}", updated_at)
 
-    fullname = f"{(r[2] or '').strip()} {(r[3] or '').strip()}".strip()
 
-    return jsonify(
-        {
-            "id": r[0],
-            "username": r[1],
-            "fullname": fullname,
-            "email": r[4],
-            "address_line1": r[5],
-            "address_line2": r[6],
-            "city": r[7],
-            "state": r[8],
-            "zip_code": r[9],
-            "phone": r[10],
-            "profession": r[11],
-            "organization": r[12],
-            "role": r[13],
-            "is_active": r[14],
-        }
+@bp.get("/api/users")
+def api_users_batch():
+    """GET /api/users?ids=1,2,3 -> several profiles in one round trip."""
+    if "user_id" not in session:
+        return jsonify({"error": "unauthorized"}), 401
+
+    try:
+        ids = [int(x) for x in (request.args.get("ids") or "").split(",") if x.strip()]
+    except ValueError:
+        return jsonify({"error": "ids must be comma separated integers"}), 400
+    if not ids or len(ids) > MAX_BATCH_PROFILES:
+        return jsonify({"error": f"between 1 and {MAX_BATCH_PROFILES} ids"}), 400
+
+    target_role = "responder" if session.get("role") == "employee" else "employee"
+    profiles = load_profiles(ids)
+    visible = [profiles[uid] for uid in dict.fromkeys(ids) if uid in profiles and profiles[uid]["role"] == target_role]
+    missing = [uid for uid in dict.fromkeys(ids) if uid not in {p["id"] for p in visible}]
+
+    if not visible:
+        return jsonify({"users": [], "missing": missing})
+
+    versions = ",".join(f"{p['id']}:{p['updated_at']}" for p in visible) + "|" + ",".join(map(str, missing))
+    updated_at = max(datetime.fromisoformat(p["updated_at"]) for p in visible)
+    return _conditional(
+        {"users": [_public(p) for p in visible], "missing": missing},
+        "b" + hashlib.sha1(versions.encode()).hexdigest()[:20],
+        updated_at,
     )
@@ -0,0 +1,6 @@
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
+
+# uvicorn asgi:app  (or gunicorn with GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker);
+# needs the optional uvicorn / aiomysql packages, wsgi.py keeps working without them
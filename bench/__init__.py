@@ -0,0 +1,13 @@
+"""
+Load-test and benchmark suite.
+
+    python -m bench.seed --employees 2000 --responders 200 --tickets 50000 --messages 100000
+    python -m bench.run --driver client --requests 200 --concurrency 8
+    python -m bench.run --driver http --base-url http://127.0.0.1:8000 \
+        --compare bench/results/<previous>.json
+
+Uses the same DB_* environment variables as the app. Seeded accounts are
+named bench_employee_<n> / bench_responder_<n> with password BENCH_PASSWORD.
+"""
+
+BENCH_PASSWORD = "bench-password"
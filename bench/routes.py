@@ -0,0 +1,191 @@
+"""
+Route catalogue for the benchmark driver.
+
+Every route of the main, auth, account, tickets, users, messages, search
+and monitoring blueprints is listed once per role that can use it. Token
+routes (/api/users/provision, /metrics) send the app's PROVISION_TOKEN /
+METRICS_TOKEN and expect 404 when it is unset. /stream is left out on
+purpose: it is a long-lived connection, not a request.
+"""
+import json
+from collections import namedtuple
+
+from flask import current_app
+
+from app.common.db import get_cursor
+from . import BENCH_PASSWORD
+
+Route = namedtuple("Route", "name method path role data expect headers")
+
+
+def R(name, method, path, role=None, data=None, expect=(200,), headers=None):
+    return Route(name, method, path, role, data, frozenset(expect), headers)
+
+
+# ---------------- Fixtures ----------------
+def load_fixtures(sample_users=50, sample_rows=50):
+    """Small random samples of seeded ids, so paths and forms point at real rows."""
+    fx = {}
+    with get_cursor() as cur:
+        for role in ("employee", "responder"):
+            cur.execute(
+                "SELECT id, username FROM users WHERE role = %s AND is_active = 1 AND username LIKE %s "
+                "ORDER BY RAND() LIMIT %s",
+                (role, f"bench\\_{role}\\_%", sample_users),
+            )
+            rows = cur.fetchall()
+            fx[f"{role}_usernames"] = [r[1] for r in rows]
+            fx[f"{role}_ids"] = [r[0] for r in rows]
+            fx.setdefault("user_ids", {}).update({r[1]: r[0] for r in rows})
+
+        fx["own_tickets"] = {}
+        for uid, username in zip(fx["employee_ids"], fx["employee_usernames"]):
+            cur.execute(
+                "SELECT id FROM tickets WHERE user_id = %s ORDER BY created_at DESC LIMIT %s",
+                (uid, sample_rows),
+            )
+            fx["own_tickets"][username] = [r[0] for r in cur.fetchall()]
+
+        cur.execute(
+            "SELECT id FROM tickets WHERE status = 'pending' ORDER BY RAND() LIMIT %s",
+            (sample_rows * 20,),
+        )
+        fx["pending_tickets"] = [r[0] for r in cur.fetchall()]
+
+        fx["inbox"] = {}
+        for username, uid in fx["user_ids"].items():
+            cur.execute(
+                "SELECT id FROM messages WHERE receiver_id = %s ORDER BY created_at DESC LIMIT %s",
+                (uid, sample_rows),
+            )
+            fx["inbox"][username] = [r[0] for r in cur.fetchall()]
+
+    fx["tokens"] = {
+        "provision": current_app.config.get("PROVISION_TOKEN"),
+        "metrics": current_app.config.get("METRICS_TOKEN"),
+    }
+    return fx
+
+
+# ---------------- Path / form builders ----------------
+def _own_ticket(ctx):
+    tickets = ctx["fixtures"]["own_tickets"].get(ctx["username"]) or [0]
+    return ctx["rnd"].choice(tickets)
+
+
+def _pending_ticket(ctx):
+    return ctx["rnd"].choice(ctx["fixtures"]["pending_tickets"] or [0])
+
+
+def _inbox_message(ctx):
+    return ctx["rnd"].choice(ctx["fixtures"]["inbox"].get(ctx["username"]) or [0])
+
+
+def _other_role_user(role):
+    other = "responder" if role == "employee" else "employee"
+    return lambda ctx: ctx["rnd"].choice(ctx["fixtures"][f"{other}_ids"])
+
+
+def _account_form(ctx):
+    return {
+        "firstname": "Bench", "lastname": "User", "dob": "1990-01-01",
+        "address_line1": "10 Main St", "address_line2": "", "city": "Springfield",
+        "state": "IL", "zip_code": "62701", "email": f"{ctx['username']}@example.com",
+        "phone_e164": "+12175550100", "profession": "Tester", "organization": "Bench Org",
+    }
+
+
+def _register_form(ctx):
+    name = f"bench_reg_{ctx['worker']}_{ctx['i']}_{ctx['rnd'].getrandbits(32):08x}"
+    return {
+        "firstname": "Bench", "lastname": "Register", "dob": "1990-01-01",
+        "username": name, "email": f"{name}@example.com",
+        "address_line1": "10 Main St", "address_line2": "", "city": "Springfield",
+        "state": "IL", "zip_code": "62701", "phone_e164": "+12175550100",
+        "profession": "Tester", "organization": "Bench Org", "organization_other": "",
+        "password": BENCH_PASSWORD, "confirm_password": BENCH_PASSWORD, "role": "employee",
+    }
+
+
+def _login_form(ctx):
+    return {"username": ctx["rnd"].choice(ctx["fixtures"]["employee_usernames"]), "password": BENCH_PASSWORD}
+
+
+def _provision_body(ctx):
+    # one new user per request, as JSON lines
+    row = _register_form(ctx)
+    row["username"] = row["username"].replace("bench_reg_", "bench_prov_")
+    row["email"] = f"{row['username']}@example.com"
+    return json.dumps(row) + "\n"
+
+
+def _bearer(name):
+    def headers(ctx):
+        token = ctx["fixtures"]["tokens"][name]
+        return {"Authorization": f"Bearer {token}"} if token else {}
+    return headers
+
+
+def _message_form(role):
+    pick = _other_role_user(role)
+    return lambda ctx: {"receiver_id": pick(ctx), "subject": "Bench", "body": "Benchmark message body."}
+
+
+ROUTES = [
+    # main
+    R("main.index", "GET", "/"),
+    R("main.home[employee]", "GET", "/home", "employee"),
+    R("main.home[responder]", "GET", "/home", "responder"),
+    # auth
+    R("auth.login[GET]", "GET", "/login"),
+    R("auth.login[POST]", "POST", "/login", data=_login_form, expect=(302,)),
+    R("auth.register[GET]", "GET", "/register"),
+    R("auth.register[POST]", "POST", "/register", data=_register_form, expect=(302,)),
+    R("auth.reactivate", "GET", "/reactivate", expect=(302,)),
+    R("auth.logout", "GET", "/logout", "employee", expect=(302,)),
+    # account
+    R("account.dashboard[employee]", "GET", "/dashboard", "employee"),
+    R("account.dashboard[responder]", "GET", "/dashboard", "responder"),
+    R("account.edit_account[GET]", "GET", "/edit_account", "employee"),
+    R("account.edit_account[POST]", "POST", "/edit_account", "employee", data=_account_form, expect=(302,)),
+    R("account.delete_account[bad]", "POST", "/delete_account", "employee",
+      data=lambda ctx: {"username": ctx["username"], "password": "wrong"}, expect=(302,)),
+    # tickets
+    R("tickets.create_ticket[GET]", "GET", "/create_ticket", "employee"),
+    R("tickets.create_ticket[POST]", "POST", "/create_ticket", "employee",
+      data=lambda ctx: {"title": "Bench printer jam", "description": "Created by bench.run"}, expect=(302,)),
+    R("tickets.manage_tickets", "GET", "/manage_tickets", "employee"),
+    R("tickets.edit_ticket[GET]", "GET", lambda ctx: f"/edit_ticket/{_own_ticket(ctx)}", "employee", expect=(200, 403)),
+    R("tickets.edit_ticket[POST]", "POST", lambda ctx: f"/edit_ticket/{_own_ticket(ctx)}", "employee",
+      data=lambda ctx: {"title": "Bench edited", "description": "Edited by bench.run"}, expect=(302,)),
+    R("tickets.update_ticket[GET]", "GET", lambda ctx: f"/update_ticket/{_pending_ticket(ctx)}", "responder"),
+    R("tickets.update_ticket[POST]", "POST", lambda ctx: f"/update_ticket/{_pending_ticket(ctx)}", "responder",
+      data=lambda ctx: {"status": "in process"}, expect=(302, 404, 409)),
+    R("tickets.claim_next", "POST", "/claim_next", "responder", expect=(302,)),
+    R("tickets.claim_ticket", "POST", lambda ctx: f"/claim_ticket/{_pending_ticket(ctx)}", "responder",
+      expect=(302, 409)),
+    R("tickets.delete_ticket", "POST", lambda ctx: f"/delete_ticket/{_own_ticket(ctx)}", "employee",
+      expect=(302, 404)),
+    # users
+    R("users.users_page[employee]", "GET", "/users", "employee"),
+    R("users.users_page[responder]", "GET", "/users", "responder"),
+    R("users.api_users_search", "GET", "/api/users/search?q=bench", "employee"),
+    R("users.api_user", "GET", lambda ctx: f"/api/user/{_other_role_user('employee')(ctx)}", "employee"),
+    R("users.api_users_batch", "GET",
+      lambda ctx: "/api/users?ids=" + ",".join(str(_other_role_user("employee")(ctx)) for _ in range(10)), "employee"),
+    R("auth.provision_users", "POST", "/api/users/provision?format=jsonl", data=_provision_body,
+      expect=(200, 404), headers=_bearer("provision")),
+    # messages
+    R("messages.messages", "GET", "/messages", "employee"),
+    R("messages.message_body", "GET", lambda ctx: f"/api/messages/{_inbox_message(ctx)}", "employee",
+      expect=(200, 404)),
+    R("messages.mark_message_read", "POST", lambda ctx: f"/messages/{_inbox_message(ctx)}/read", "employee",
+      expect=(302,)),
+    R("messages.mark_all_messages_read", "POST", "/messages/read_all", "employee", expect=(302,)),
+    R("messages.send_message", "POST", "/messages/send", "employee", data=_message_form("employee"), expect=(302,)),
+    # search
+    R("search.search_page", "GET", "/search?q=printer", "employee"),
+    R("search.api_search[responder]", "GET", "/api/tickets/search?q=printer+jam", "responder"),
+    # monitoring
+    R("monitoring.metrics", "GET", "/metrics", expect=(200, 404), headers=_bearer("metrics")),
+]
@@ -0,0 +1,206 @@
+"""
+Drive every blueprint route and report throughput and latency percentiles.
+
+Two drivers:
+  client  - Flask test client in-process (no network, isolates app + DB time)
+  http    - real HTTP against a running server (gunicorn etc.), via urllib
+
+Each worker thread logs in as its own seeded user, so the numbers include
+session handling. Results are written as JSON for run-to-run comparison.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from . import BENCH_PASSWORD
+from .routes import ROUTES, load_fixtures
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+# ---------------- Drivers ----------------
+class ClientDriver:
+    """One Flask test client (cookie jar) per worker thread."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def session(self):
+        return self.app.test_client()
+
+    def request(self, client, method, path, data=None, headers=None):
+        resp = client.open(path, method=method, data=data, headers=headers)
+        resp.close()
+        return resp.status_code
+
+
+class HttpDriver:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    class _NoRedirect(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, *args, **kwargs):
+            return None
+
+    def session(self):
+        jar = http.cookiejar.CookieJar()
+        return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), self._NoRedirect())
+
+    def request(self, opener, method, path, data=None, headers=None):
+        if isinstance(data, dict):
+            body = urllib.parse.urlencode(data).encode()
+        else:
+            body = data.encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers or {}, method=method)
+        try:
+            with opener.open(req, timeout=30) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+
+# ---------------- Measurement ----------------
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(samples, wall_seconds):
+    latencies = sorted(ms for ms, _ok in samples)
+    errors = sum(1 for _ms, ok in samples if not ok)
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / wall_seconds, 2) if wall_seconds else None,
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 3) if latencies else None,
+    }
+
+
+def run_route(driver, route, fixtures, requests, concurrency, seed):
+    samples = []
+    lock = threading.Lock()
+    per_worker = max(1, requests // concurrency)
+
+    def worker(n):
+        rnd = random.Random(seed * 1000 + n)
+        sess = driver.session()
+        username = None
+        if route.role:
+            username = rnd.choice(fixtures[f"{route.role}_usernames"])
+            driver.request(sess, "POST", "/login", {"username": username, "password": BENCH_PASSWORD})
+        ctx = {"rnd": rnd, "fixtures": fixtures, "worker": n, "username": username}
+
+        local = []
+        for i in range(per_worker):
+            ctx["i"] = i
+            path = route.path(ctx) if callable(route.path) else route.path
+            data = route.data(ctx) if route.data else None
+            headers = route.headers(ctx) if route.headers else None
+            started = time.perf_counter()
+            status = driver.request(sess, route.method, path, data, headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            local.append((elapsed, status in route.expect))
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return summarize(samples, time.perf_counter() - started)
+
+
+# ---------------- Reporting ----------------
+def print_table(results, baseline=None):
+    header = f"{'route':34} {'n':>6} {'err':>5} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}"
+    if baseline:
+        header += f" {'p95 Δ':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results["routes"].items():
+        line = (
+            f"{name:34} {r['count']:6} {r['errors']:5} {r['rps'] or 0:9.1f} "
+            f"{r['p50_ms'] or 0:9.2f} {r['p95_ms'] or 0:9.2f} {r['p99_ms'] or 0:9.2f}"
+        )
+        prev = (baseline or {}).get("routes", {}).get(name)
+        if prev and prev.get("p95_ms") and r.get("p95_ms"):
+            line += f" {(r['p95_ms'] / prev['p95_ms'] - 1) * 100:+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--driver", choices=["client", "http"], default="client")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", help="comma separated route names (default: all)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="result file (default: bench/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="previous result file to diff p95 against")
+    args = parser.parse_args()
+
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        fixtures = load_fixtures()
+
+    if args.driver == "client":
+        driver = ClientDriver(app)
+    else:
+        driver = HttpDriver(args.base_url)
+
+    only = set(args.only.split(",")) if args.only else None
+    results = {
+        "meta": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "driver": args.driver,
+            "requests_per_route": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "host": platform.node(),
+        },
+        "routes": {},
+    }
+
+    for route in ROUTES:
+        if only and route.name not in only:
+            continue
+        results["routes"][route.name] = run_route(
+            driver, route, fixtures, args.requests, args.concurrency, args.seed
+        )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    out = args.out or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nresults written to {out}")
+
+
+if __name__ == "__main__":
+    main()
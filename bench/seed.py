@@ -0,0 +1,48 @@
+"""
+Seed the configured MySQL database with benchmark data.
+
+Thin wrapper around app.datagen (the same generator as `flask generate-data`)
+with the bench_ username prefix and BENCH_PASSWORD, so bench.run can find
+and log in as the seeded accounts.
+"""
+import argparse
+import time
+from datetime import datetime
+
+from app import create_app
+from app.datagen import generate
+from app.extensions import db_pool
+from . import BENCH_PASSWORD
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--responders", type=int, default=20)
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--declined-rate", type=float, default=0.15,
+                        help="Share of open tickets declined by 1-3 responders.")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--mode", choices=["insert", "infile"], default="insert")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--now", type=datetime.fromisoformat,
+                        help="End of the generated history (default: current time).")
+    args = parser.parse_args()
+
+    create_app()
+    users = args.employees + args.responders
+    started = time.monotonic()
+    generate(
+        db_pool.connect_kwargs, users=users, tickets=args.tickets, messages=args.messages,
+        responder_ratio=args.responders / users if users else 0, declined_rate=args.declined_rate,
+        workers=args.workers,
+        batch=args.batch, mode=args.mode, seed=args.seed, prefix="bench", password=BENCH_PASSWORD,
+        now=args.now,
+    )
+    print(f"seeded in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+gunicorn settings, picked up automatically from the working directory:
+
+    gunicorn wsgi:app
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn asgi:app
+
+GUNICORN_PRELOAD=1 imports and builds the app once in the master and forks
+workers from it (faster worker start, shared memory pages). That is safe
+because create_app() opens no sockets and post_fork below drops anything
+pooled in the master; the events writer and pub/sub listener threads are
+started lazily per process.
+"""
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+if os.getenv("GUNICORN_WORKER_CLASS"):
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS")
+
+
+def post_fork(server, worker):
+    from app.extensions import db_pool, db_replicas
+
+    db_pool.reset()
+    db_replicas.reset()
@@ -174,3 +174,154 @@ ALTER TABLE users
   ADD COLUMN state CHAR(2) NULL AFTER city,
   ADD COLUMN zip_code VARCHAR(10) NULL AFTER state;
 
+
+-- 4. Precomputed per-responder work queue (maintained by app/tickets/queue.py):
+CREATE TABLE responder_queue (
+  responder_id INT NOT NULL,
+  ticket_id INT NOT NULL,
+  created_at DATETIME NOT NULL,   -- copy of tickets.created_at, for ordering
+
+  PRIMARY KEY (responder_id, ticket_id),
+  CONSTRAINT fk_rq_responder
+    FOREIGN KEY (responder_id) REFERENCES users(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_rq_ticket
+    FOREIGN KEY (ticket_id) REFERENCES tickets(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  INDEX idx_rq_responder_created (responder_id, created_at, ticket_id),
+  INDEX idx_rq_ticket (ticket_id)
+) ENGINE=InnoDB;
+
+-- backfill from existing data
+INSERT INTO responder_queue (responder_id, ticket_id, created_at)
+SELECT r.id, t.id, t.created_at
+FROM tickets t
+JOIN users r
+  ON r.role = 'responder'
+ AND (t.responder_id IS NULL OR t.responder_id = r.id)
+WHERE t.status IN ('pending', 'in process')
+  AND NOT EXISTS (
+      SELECT 1 FROM ticket_responder_log log
+      WHERE log.ticket_id = t.id
+        AND log.responder_id = r.id
+        AND log.status = 'declined'
+  );
+
+
+-- 5. Full-text index for ticket search (app/search/routes.py):
+ALTER TABLE tickets
+  ADD FULLTEXT INDEX ft_tickets_title_description (title, description);
+
+
+-- 6. Keep the audit trail when a ticket is deleted (app/tickets/events.py
+--    records a 'deleted' event after the row is gone):
+ALTER TABLE ticket_events
+  DROP FOREIGN KEY fk_events_ticket;
+
+
+-- 7. Archive of finished work (flask archive-tickets, app/tickets/archive.py).
+--    Range-partitioned by completed_at so old years can be dropped with
+--    ALTER TABLE ... DROP PARTITION; split p_future with REORGANIZE PARTITION
+--    before it fills up. Partitioned tables cannot carry foreign keys and the
+--    partitioning column must be part of the primary key.
+CREATE TABLE tickets_archive (
+  id INT NOT NULL,
+  user_id INT NOT NULL,
+  responder_id INT NULL,
+  title TEXT NOT NULL,
+  description TEXT NOT NULL,
+  status ENUM('pending','in process','done') NOT NULL,
+  created_at DATETIME NOT NULL,
+  updated_at DATETIME NOT NULL,
+  completed_at DATETIME NOT NULL,
+  archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+  PRIMARY KEY (id, completed_at),
+  INDEX idx_ta_user_created (user_id, created_at),
+  INDEX idx_ta_responder_created (responder_id, created_at)
+) ENGINE=InnoDB
+PARTITION BY RANGE COLUMNS (completed_at) (
+  PARTITION p2024 VALUES LESS THAN ('2025-01-01'),
+  PARTITION p2025 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p2026 VALUES LESS THAN ('2027-01-01'),
+  PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE TABLE ticket_responder_log_archive (
+  ticket_id INT NOT NULL,
+  responder_id INT NOT NULL,
+  status ENUM('declined') NOT NULL,
+  created_at DATETIME NOT NULL,
+  completed_at DATETIME NOT NULL,   -- of the ticket, partitioning key
+
+  PRIMARY KEY (ticket_id, responder_id, completed_at),
+  INDEX idx_trla_responder_created (responder_id, created_at)
+) ENGINE=InnoDB
+PARTITION BY RANGE COLUMNS (completed_at) (
+  PARTITION p2024 VALUES LESS THAN ('2025-01-01'),
+  PARTITION p2025 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p2026 VALUES LESS THAN ('2027-01-01'),
+  PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE TABLE ticket_events_archive (
+  id BIGINT NOT NULL,
+  ticket_id INT NOT NULL,
+  actor_user_id INT NOT NULL,
+  event_type ENUM('created','edited','assigned','status_changed','declined','deleted') NOT NULL,
+  from_status ENUM('pending','in_process','done') NULL,
+  to_status   ENUM('pending','in_process','done') NULL,
+  note VARCHAR(255) NULL,
+  created_at DATETIME NOT NULL,
+  completed_at DATETIME NOT NULL,   -- of the ticket, partitioning key
+
+  PRIMARY KEY (id, completed_at),
+  INDEX idx_tea_ticket_time (ticket_id, created_at)
+) ENGINE=InnoDB
+PARTITION BY RANGE COLUMNS (completed_at) (
+  PARTITION p2024 VALUES LESS THAN ('2025-01-01'),
+  PARTITION p2025 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p2026 VALUES LESS THAN ('2027-01-01'),
+  PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+
+-- 8. Responder history on /dashboard (app/account/routes.py): every branch
+--    of the merged feed is a range read on (responder_id, status, <time>),
+--    and the per-status counts are answered from the same indexes.
+UPDATE tickets SET completed_at = updated_at WHERE status = 'done' AND completed_at IS NULL;
+
+ALTER TABLE tickets
+  DROP INDEX idx_tickets_responder_status,
+  ADD INDEX idx_tickets_responder_status_completed (responder_id, status, completed_at),
+  ADD INDEX idx_tickets_responder_status_updated (responder_id, status, updated_at);
+
+ALTER TABLE ticket_responder_log
+  DROP INDEX idx_trl_responder_status,
+  ADD INDEX idx_trl_responder_status_created (responder_id, status, created_at);
+
+ALTER TABLE tickets_archive
+  ADD INDEX idx_ta_responder_status_completed (responder_id, status, completed_at);
+
+ALTER TABLE ticket_responder_log_archive
+  ADD INDEX idx_trla_responder_status_created (responder_id, status, created_at);
+
+
+-- 9. Users directory prefix search (app/users/routes.py): one range read per
+--    searched column, and DISTINCT organizations via a loose index scan.
+ALTER TABLE users
+  ADD INDEX idx_users_role_username (role, username),
+  ADD INDEX idx_users_role_firstname (role, firstname),
+  ADD INDEX idx_users_role_lastname (role, lastname),
+  ADD INDEX idx_users_role_org (role, organization, username);
+
+
+-- 10. Archiving batches (app/tickets/archive.py) find old done tickets with a
+--     range read on (status, completed_at), in index order. Alert messages
+--     keep their ticket_id when the ticket is archived or deleted (like
+--     ticket_events, change 6); an archived ticket is in tickets_archive.
+ALTER TABLE tickets
+  ADD INDEX idx_tickets_status_completed (status, completed_at);
+
+ALTER TABLE messages
+  DROP FOREIGN KEY fk_messages_ticket;
@@ -1,3 +1,5 @@
-from app import app  
+from app import create_app
 
-# gunicorn can also run: gunicorn wsgi:app
+app = create_app()
+
+# gunicorn can also run: gunicorn wsgi:app  (settings in gunicorn.conf.py)